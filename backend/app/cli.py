@@ -0,0 +1,307 @@
+"""Headless batch documentation of many repositories.
+
+Usage:
+    python -m app.cli REPOS_DIR_OR_MANIFEST --output docs_out [--workers 8]
+        [--processes N] [--llm-concurrency 4] [--format json,markdown]
+
+REPOS_DIR_OR_MANIFEST is either a directory whose subdirectories (or .zip
+files) are repositories, or a manifest: a .json list of paths or
+{"name": ..., "path": ...} objects, or a text file with one path per line.
+
+Ingestion, static analysis and the non-Gemini part of the documentation
+(component ASTs, import graph, routing, templates, code quality metrics)
+are CPU-bound and run in a pool of --processes worker processes. --workers
+only bounds how many repositories are in progress at once, which overlaps
+their Gemini calls.
+
+Output files are named after the repositories, so two repositories may not
+share a name (for example 'foo/' and 'foo.zip', or manifest entries with
+the same stem); name manifest entries explicitly to tell them apart.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from app.services import llm, model_routing
+from app.services.documentation import (
+    analyze_project_structure,
+    complete_documentation,
+    generate_project_description,
+    prepare_documentation
+)
+from app.services.ingestion import read_project_directory
+from app.services.rendering import render_markdown
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('ingest', 'analyze', 'document', 'write')
+
+# Stages timed inside a worker process, where nothing else runs concurrently.
+# The other stages interleave with other repositories on the event loop, so
+# their time is per-repository latency rather than busy time.
+PROCESS_STAGES = ('ingest', 'analyze')
+
+DEFAULT_WORKERS = 8
+
+
+def load_repositories(source: Path) -> List[Tuple[str, Path]]:
+    """Resolve the input directory or manifest into (name, path) pairs.
+
+    Raises ValueError when two repositories resolve to the same name, as
+    their output files would overwrite each other.
+    """
+    if source.is_dir():
+        repositories = [
+            (path.stem if path.suffix == '.zip' else path.name, path)
+            for path in sorted(source.iterdir())
+            if path.is_dir() or path.suffix == '.zip'
+        ]
+    elif source.suffix == '.json':
+        repositories = []
+        for entry in json.loads(source.read_text()):
+            if isinstance(entry, str):
+                entry = {"path": entry}
+            path = source.parent / entry["path"]
+            repositories.append((entry.get("name") or path.stem, path))
+    else:
+        paths = [line.strip() for line in source.read_text().splitlines()]
+        repositories = [(Path(path).stem, source.parent / path) for path in paths if path and not path.startswith('#')]
+
+    paths_by_name: Dict[str, List[str]] = {}
+    for name, path in repositories:
+        paths_by_name.setdefault(name, []).append(str(path))
+    duplicates = {name: paths for name, paths in paths_by_name.items() if len(paths) > 1}
+    if duplicates:
+        raise ValueError("repositories with the same output name: " + "; ".join(
+            f"{name} ({', '.join(paths)})" for name, paths in sorted(duplicates.items())
+        ))
+    return repositories
+
+
+@contextmanager
+def unpacked(path: Path) -> Iterator[Path]:
+    """Yield a directory for a repository, extracting .zip archives to a temp dir."""
+    if path.is_dir():
+        yield path
+        return
+
+    temp_dir = Path(tempfile.mkdtemp(prefix='docgen-'))
+    try:
+        shutil.unpack_archive(str(path), str(temp_dir))
+        yield temp_dir
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def record_stage(stats: Dict[str, Dict[str, float]], stage: str, files: int, seconds: float):
+    stage_stats = stats[stage]
+    stage_stats["runs"] += 1
+    stage_stats["files"] += files
+    stage_stats["seconds"] += seconds
+
+
+@contextmanager
+def timed(stats: Dict[str, Dict[str, float]], stage: str) -> Iterator[Dict[str, float]]:
+    """Record the duration of one stage run; the caller adds the file count."""
+    entry = {"files": 0}
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        record_stage(stats, stage, entry["files"], time.perf_counter() - start)
+
+
+def analyze_repository(name: str, path: Path) -> Dict[str, Any]:
+    """Ingest and statically analyze one repository in a worker process.
+
+    Returns the files, the documentation prepared without Gemini text, the
+    routing decisions made for it and the time spent on each stage in this
+    process.
+    """
+    start = time.perf_counter()
+    with unpacked(path) as root:
+        files_content, excluded_files = read_project_directory(root)
+    ingest_seconds = time.perf_counter() - start
+
+    # The process is reused across repositories, report this one's decisions only
+    model_routing.reset_stats()
+    start = time.perf_counter()
+
+    async def analyze() -> Dict[str, Any]:
+        project_info = await analyze_project_structure(files_content, excluded_files)
+        return await prepare_documentation(name, files_content, project_info)
+
+    documentation = asyncio.run(analyze())
+    return {
+        "files_content": files_content,
+        "documentation": documentation,
+        "routing": model_routing.snapshot_stats(),
+        "seconds": {"ingest": ingest_seconds, "analyze": time.perf_counter() - start}
+    }
+
+
+async def document_repository(
+    name: str,
+    path: Path,
+    output_dir: Path,
+    formats: List[str],
+    stats: Dict[str, Dict[str, float]],
+    executor: Executor
+) -> Dict[str, Any]:
+    """Run ingestion, analysis, documentation and output for one repository."""
+    result = await asyncio.get_running_loop().run_in_executor(executor, analyze_repository, name, path)
+    files_content = result["files_content"]
+    for stage in PROCESS_STAGES:
+        record_stage(stats, stage, len(files_content), result["seconds"][stage])
+    model_routing.merge_stats(result["routing"])
+
+    # Only the Gemini calls are left for the event loop
+    with timed(stats, 'document') as entry:
+        documentation = result["documentation"]
+        documentation["project_info"] = {
+            "description": await generate_project_description(files_content),
+            **documentation["project_info"]
+        }
+        await complete_documentation(documentation, files_content)
+        entry["files"] = len(files_content)
+
+    with timed(stats, 'write') as entry:
+        if 'json' in formats:
+            data = json.dumps(documentation, indent=2, default=list)
+            await asyncio.to_thread((output_dir / f"{name}.json").write_text, data)
+            entry["files"] += 1
+        if 'markdown' in formats:
+            await asyncio.to_thread((output_dir / f"{name}.md").write_text, render_markdown(documentation))
+            entry["files"] += 1
+
+    return {"name": name, "status": "success", "files": len(files_content)}
+
+
+def summarize_stages(stats: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, Any]]:
+    """Throughput of the process stages and mean latency of the loop stages."""
+    summary = {}
+    for stage, values in stats.items():
+        entry = {**values, "seconds": round(values["seconds"], 3)}
+        if stage in PROCESS_STAGES:
+            # Files per second of busy time in one worker process
+            entry["files_per_second"] = round(values["files"] / values["seconds"], 2) if values["seconds"] else 0.0
+        else:
+            entry["mean_seconds"] = round(values["seconds"] / values["runs"], 3) if values["runs"] else 0.0
+        summary[stage] = entry
+    return summary
+
+
+async def run_batch(
+    repositories: List[Tuple[str, Path]],
+    output_dir: Path,
+    workers: int,
+    formats: List[str],
+    processes: int = None
+) -> Dict[str, Any]:
+    """Document every repository with at most `workers` in progress at once."""
+    stats = {stage: {"runs": 0, "files": 0, "seconds": 0.0} for stage in STAGES}
+    model_routing.reset_stats()
+    semaphore = asyncio.Semaphore(workers)
+    # Spawned workers do not inherit the event loop and its threads
+    executor = ProcessPoolExecutor(max_workers=processes or os.cpu_count() or 1, mp_context=multiprocessing.get_context('spawn'))
+
+    async def worker(name: str, path: Path) -> Dict[str, Any]:
+        async with semaphore:
+            logger.info(f"Documenting {name}")
+            try:
+                return await document_repository(name, path, output_dir, formats, stats, executor)
+            except Exception as e:
+                logger.error(f"Error documenting {name}: {str(e)}")
+                return {"name": name, "status": "error", "error": str(e)}
+
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(worker(name, path) for name, path in repositories))
+    finally:
+        executor.shutdown()
+    elapsed = time.perf_counter() - start
+    files = sum(result.get("files", 0) for result in results)
+
+    return {
+        "repositories": results,
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second": round(files / elapsed, 2) if elapsed else 0.0,
+        "stages": summarize_stages(stats),
+        "llm": llm.get_stats(),
+        "routing": model_routing.get_stats()
+    }
+
+
+def print_summary(summary: Dict[str, Any]):
+    """Print per-stage throughput and the overall result of a batch run."""
+    results = summary["repositories"]
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    elapsed = summary["elapsed_seconds"]
+
+    print(f"\nDocumented {succeeded}/{len(results)} repositories in {elapsed:.1f}s "
+          f"({len(results) / elapsed if elapsed else 0:.2f} repos/s, {summary['files_per_second']:.1f} files/s)")
+    print(f"{'stage':<10}{'runs':>8}{'files':>10}{'seconds':>10}")
+    for stage, values in summary["stages"].items():
+        line = f"{stage:<10}{values['runs']:>8}{values['files']:>10}{values['seconds']:>10.1f}"
+        if stage in PROCESS_STAGES:
+            print(f"{line}  {values['files_per_second']:.1f} files/s per process")
+        else:
+            print(f"{line}  {values['mean_seconds']:.2f}s per repository, overlapped")
+
+    llm_stats = summary["llm"]
+    print(f"llm: {llm_stats['calls']} calls, {llm_stats['coalesced']} coalesced, {llm_stats['errors']} errors, "
+          f"{llm_stats['seconds']:.1f}s, concurrency {llm_stats['concurrency']}")
+    routing = summary["routing"]
+    print(f"routing: {routing['decisions']['template']} template, {routing['decisions']['remote']} remote, "
+          f"{routing['decisions']['docstring']} docstring, "
+          f"~{routing['latency_saved_seconds']:.1f}s of Gemini latency saved")
+    for result in results:
+        if result["status"] != "success":
+            print(f"FAILED {result['name']}: {result['error']}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate documentation for many repositories.")
+    parser.add_argument("source", type=Path, help="directory of repositories or a manifest file")
+    parser.add_argument("--output", type=Path, default=Path("docs_output"), help="output directory")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="repositories in progress at once, overlapping Gemini calls")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes for ingestion and static analysis")
+    parser.add_argument("--llm-concurrency", type=int, default=llm.LLM_CONCURRENCY, help="maximum concurrent Gemini calls")
+    parser.add_argument("--format", default="json,markdown", help="comma separated output formats: json, markdown")
+    args = parser.parse_args(argv)
+
+    formats = [fmt.strip() for fmt in args.format.split(',') if fmt.strip()]
+    unknown = set(formats) - {'json', 'markdown'}
+    if unknown:
+        parser.error(f"unknown format: {', '.join(sorted(unknown))}")
+
+    try:
+        repositories = load_repositories(args.source)
+    except ValueError as e:
+        parser.error(str(e))
+    if not repositories:
+        parser.error(f"no repositories found in {args.source}")
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    llm.set_concurrency(args.llm_concurrency)
+
+    summary = asyncio.run(run_batch(repositories, args.output, max(1, args.workers), formats, max(1, args.processes)))
+    (args.output / "_summary.json").write_text(json.dumps(summary, indent=2))
+    print_summary(summary)
+    return 0 if all(result["status"] == "success" for result in summary["repositories"]) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -1,19 +1,43 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import Dict, Any, List
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import BaseModel
+from typing import Dict, Any, List, Optional
+import asyncio
+import itertools
 import logging
+import time
 import json
 import shutil
 import os
 from pathlib import Path
-import chardet
 from app.services.documentation import (
+    DOCUMENTATION_SECTIONS,
     process_project,
+    update_project,
+    generate_documentation,
     analyze_main_components,
     extract_file_description,
     extract_classes,
     extract_functions,
     generate_project_summary,
-    analyze_code_quality
+    analyze_code_quality,
+    measure_code_quality
+)
+from app.services.ingestion import decode_project_blobs, read_project_directory
+from app.services.git_ingest import GitError, RepositoryNotAllowed, allowed_repository, merge_changed_files, read_changes
+from app.services import llm, model_routing
+from app.services.site_export import export_site, site_path, zip_site
+from app.utils.singleflight import SingleFlight
+from app.utils.content_store import ContentStore
+from app.utils.file_classifier import load_ignore_rules, summarize_exclusions
+from app.utils.import_graph import build_import_graph, compute_centrality
+from app.utils.search_index import build_search_index, component_documents
+from app.utils.pagination import (
+    field_requested,
+    paginate_items,
+    paginate_keys,
+    parse_fields,
+    select_fields
 )
 
 router = APIRouter()
@@ -22,26 +46,19 @@ logger = logging.getLogger(__name__)
 # Store processed projects in memory
 processed_projects = {}
 
-def read_file_content(file_path: Path) -> str:
-    """Read file content with proper encoding detection."""
-    try:
-        # Skip binary files
-        if file_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.pyc', '.zip']:
-            return ""
-            
-        # Read the file in binary mode first
-        with open(file_path, 'rb') as file:
-            raw_data = file.read()
-            
-        # Detect the encoding
-        result = chardet.detect(raw_data)
-        encoding = result['encoding'] if result['encoding'] else 'utf-8'
-            
-        # Decode the content with the detected encoding
-        return raw_data.decode(encoding)
-    except Exception as e:
-        logger.warning(f"Could not read file {file_path}: {str(e)}")
-        return ""
+# Search index over each project's symbols and generated descriptions
+search_indexes = {}
+
+# Deduplicated UTF-8 file contents, cold projects are spilled to memory-mapped files
+content_store = ContentStore()
+
+# Every upload or sync gets a new version, so cached and in-flight work is keyed per content
+_project_versions = itertools.count(1)
+
+# Concurrent identical documentation requests share one computation
+documentation_flight = SingleFlight("documentation")
+component_flight = SingleFlight("component")
+site_flight = SingleFlight("site_export")
 
 @router.post("/projects")
 async def upload_project(file: UploadFile = File(...)):
@@ -56,30 +73,32 @@ async def upload_project(file: UploadFile = File(...)):
         # Save the uploaded file
         file_path = temp_dir / file.filename
         with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+            await asyncio.to_thread(shutil.copyfileobj, file.file, buffer)
             
         # Extract the zip file
         if file.filename.endswith('.zip'):
-            shutil.unpack_archive(file_path, temp_dir)
+            await asyncio.to_thread(shutil.unpack_archive, file_path, temp_dir)
             
-        # Read all project files
-        files_content = {}
-        for path in temp_dir.rglob('*'):
-            if path.is_file():
-                content = read_file_content(path)
-                if content:  # Only include files we could read
-                    relative_path = str(path.relative_to(temp_dir))
-                    files_content[relative_path] = content
-                    
+        # Read the analyzable files, skipping ignored, generated and vendored ones
+        files_content, excluded_files = await asyncio.to_thread(read_project_directory, temp_dir)
+
         # Process the project
-        result = await process_project(files_content)
+        analysis_cache = {}
+        result = await process_project(files_content, excluded_files, analysis_cache)
         
         if result.get("status") == "success":
             project_name = file.filename.replace(".zip", "")
             processed_projects[project_name] = {
-                "files_content": files_content,
-                "project_info": result.get("project_info", {})
+                "files_content": content_store.add_project(project_name, files_content),
+                "project_info": result.get("project_info", {}),
+                "excluded_files": excluded_files,
+                "analysis_cache": analysis_cache,
+                "version": next(_project_versions)
             }
+            search_indexes[project_name] = build_search_index(
+                result.get("project_info", {}).get("key_components", [])
+            )
+            await asyncio.to_thread(content_store.spill_cold)
             return {"status": "success", "project_name": project_name}
         else:
             raise HTTPException(status_code=400, detail=result.get("error", "Processing failed"))
@@ -92,54 +111,436 @@ async def upload_project(file: UploadFile = File(...)):
         if temp_dir.exists():
             shutil.rmtree(temp_dir)
 
+class GitSyncRequest(BaseModel):
+    """A local repository path or bundle file and the commit range to document."""
+    repository: str
+    head: str = "HEAD"
+    base: Optional[str] = None
+
+@router.post("/projects/{project_name}/git-sync")
+async def sync_project_from_git(project_name: str, request: GitSyncRequest):
+    """Create or update a project from a git commit range.
+
+    For a project synced from git before, base defaults to its stored
+    revision and must match it (409 otherwise), so the stored analysis
+    cannot drift from the repository. Only the blobs changed between base
+    and head are read from the git object database, and only those files
+    are analyzed again. New projects and projects uploaded as archives are
+    processed from every file at head. The repository must lie under one
+    of the DOCGEN_GIT_ROOTS directories (403 otherwise).
+    """
+    try:
+        project = processed_projects.get(project_name)
+        revision = project.get("revision") if project is not None else None
+        base = (request.base or revision) if revision else None
+        repository = allowed_repository(request.repository)
+        changes = await asyncio.to_thread(read_changes, repository, request.head, base)
+        if base is not None and changes["base"] != revision:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Base {request.base} does not match the synced revision {revision}"
+            )
+        
+        files_content, excluded_files = await asyncio.to_thread(
+            decode_project_blobs, changes["blobs"], load_ignore_rules(changes["ignore_files"])
+        )
+        
+        if base is None:
+            analysis_cache = {}
+            result = await process_project(files_content, excluded_files, analysis_cache)
+            if result.get("status") != "success":
+                raise HTTPException(status_code=400, detail=result.get("error", "Processing failed"))
+            processed_projects[project_name] = {
+                "files_content": content_store.add_project(project_name, files_content),
+                "project_info": result.get("project_info", {}),
+                "excluded_files": excluded_files,
+                "analysis_cache": analysis_cache,
+                "revision": changes["head"],
+                "version": next(_project_versions)
+            }
+            search_indexes[project_name] = build_search_index(
+                result.get("project_info", {}).get("key_components", [])
+            )
+            await asyncio.to_thread(content_store.spill_cold)
+            return {
+                "status": "success",
+                "project_name": project_name,
+                "revision": changes["head"],
+                "changed": len(files_content),
+                "removed": 0
+            }
+        
+        # Changed files that are now excluded are dropped like removed ones
+        removed_files, excluded = merge_changed_files(
+            project.get("excluded_files", {}),
+            list(changes["blobs"]),
+            changes["removed"],
+            files_content,
+            excluded_files
+        )
+        analysis_cache = project.setdefault("analysis_cache", {})
+        with project["files_content"].in_use() as project_files:
+            project_info = await update_project(
+                project_files,
+                project["project_info"],
+                files_content,
+                removed_files,
+                analysis_cache
+            )
+            project["excluded_files"] = excluded
+            project_info["excluded_files"] = summarize_exclusions(excluded)
+            project["project_info"] = project_info
+            project["revision"] = changes["head"]
+            project["version"] = next(_project_versions)
+            
+            # Refresh generated component docs for touched files only, ranked in the whole project
+            analyzed = project.get("components")
+            if analyzed is not None:
+                for path in removed_files:
+                    analyzed.pop(path, None)
+                    project.get("component_digests", {}).pop(path, None)
+                changed_files = [filename for filename in files_content if filename in project_files]
+                components = await analyze_main_components(
+                    project_files, filenames=changed_files, import_names=analysis_cache.setdefault("import_names", {})
+                )
+                _cache_components(project, changed_files, components)
+        
+        # Changed files that lost their symbols or left key_components drop out of the index too
+        search_indexes.setdefault(project_name, build_search_index([])).replace_files(
+            list(files_content) + removed_files,
+            [
+                (analyzed or {}).get(component["file"], component)
+                for component in project_info.get("key_components", [])
+                if component["file"] in files_content
+            ]
+        )
+        
+        return {
+            "status": "success",
+            "project_name": project_name,
+            "revision": changes["head"],
+            "changed": len(files_content),
+            "removed": len(removed_files)
+        }
+        
+    except HTTPException:
+        raise
+    except RepositoryNotAllowed as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except GitError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error syncing {project_name} from git: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/projects")
-async def list_projects():
-    """List all processed projects."""
+async def list_projects(cursor: Optional[str] = None, limit: Optional[int] = None, fields: Optional[str] = None):
+    """List processed projects a page at a time.
+
+    fields= selects which project_info keys are returned (for example
+    'technologies,entry_points'), by default the full info is included.
+    """
     try:
+        info_fields = parse_fields(fields)
+        names, next_cursor = paginate_keys(sorted(processed_projects.keys()), cursor, limit)
+        
         projects = []
-        for name, data in processed_projects.items():
+        for name in names:
             projects.append({
                 "name": name,
-                "info": data.get("project_info", {}),
+                "info": select_fields(processed_projects[name].get("project_info", {}), info_fields),
                 "status": "success"
             })
-        return projects
+        # Returning the response directly skips FastAPI's jsonable_encoder walk over the payload
+        return ORJSONResponse({
+            "items": projects,
+            "next_cursor": next_cursor,
+            "total": len(processed_projects)
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing projects: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-docs/{project_name}")
-async def generate_project_documentation(project_name: str):
-    """Generate documentation for a specific project."""
+async def generate_project_documentation(project_name: str, fields: Optional[str] = None):
+    """Generate documentation for a specific project.
+
+    fields= selects dotted sections of the documentation, for example
+    'project_info.description,analysis.summary'. Analysis sections that are
+    not requested are not computed, components can then be fetched per file.
+    """
     try:
         if project_name not in processed_projects:
             raise HTTPException(status_code=404, detail="Project not found")
             
+        selected = parse_fields(fields)
         project = processed_projects[project_name]
-        files_content = project.get("files_content", {})
+        sections = tuple(
+            section for section in DOCUMENTATION_SECTIONS
+            if field_requested(selected, section if section == "file_structure" else f"analysis.{section}")
+        )
         
-        documentation = {
-            "project_name": project_name,
-            "project_info": project.get("project_info", {}),
-            "file_structure": {
-                name: {"type": "file"} for name in files_content.keys()
-            },
-            "analysis": {
-                "summary": await generate_project_summary(files_content),
-                "components": await analyze_main_components(files_content),
-                "code_quality": await analyze_code_quality(files_content)
-            }
-        }
+        # Callers asking for the same sections of the same project version share one run
+        key = (project_name, project.get("version"), sections)
+        documentation = await documentation_flight.run(key, _build_documentation, project_name, project, sections)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
-            "documentation": documentation
-        }
+            "documentation": select_fields(documentation, selected)
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating documentation for {project_name}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _build_documentation(project_name: str, project: Dict[str, Any], sections: tuple) -> Dict[str, Any]:
+    """Generate documentation and cache the analyzed components of a project."""
+    # A re-upload during generation replaces the files, keep reading this version
+    with project["files_content"].in_use() as files_content:
+        documentation = await generate_documentation(
+            project_name,
+            files_content,
+            project.get("project_info", {}),
+            list(sections)
+        )
+    
+    components = documentation["analysis"].get("components")
+    if components is not None:
+        project["components"] = {}
+        project["component_digests"] = {}
+        _cache_components(project, [filename for filename in files_content if filename.endswith('.py')], components)
+        
+        # Re-index the analyzed files so their generated descriptions are searchable
+        index = search_indexes.setdefault(project_name, build_search_index([]))
+        for component in components:
+            index.update_file(component["file"], component_documents(component))
+    if "code_quality" in documentation["analysis"]:
+        project["code_quality"] = documentation["analysis"]["code_quality"]
+    return documentation
+
+def _cache_components(project: Dict[str, Any], filenames: List[str], components: List[Dict[str, Any]]):
+    """Cache the components analyzed from filenames with the content hash of each file.
+
+    Files without components are recorded too, so they are not analyzed
+    again until their content changes.
+    """
+    files_content = project["files_content"]
+    analyzed = project.setdefault("components", {})
+    digests = project.setdefault("component_digests", {})
+    found = {component["file"]: component for component in components}
+    for filename in filenames:
+        digests[filename] = files_content.digest(filename)
+        if filename in found:
+            analyzed[filename] = found[filename]
+        else:
+            analyzed.pop(filename, None)
+
+@router.get("/projects/{project_name}/components")
+async def list_project_components(project_name: str, cursor: Optional[str] = None, limit: Optional[int] = None):
+    """List a project's components a page at a time, most central first.
+
+    Only names and symbol counts are returned, plus the description of
+    components that were already analyzed.
+    """
+    try:
+        if project_name not in processed_projects:
+            raise HTTPException(status_code=404, detail="Project not found")
+            
+        project = processed_projects[project_name]
+        analyzed = project.get("components", {})
+        central = {
+            module["file"]: module["centrality"]
+            for module in project.get("project_info", {}).get("central_modules", [])
+        }
+        key_components = sorted(
+            project.get("project_info", {}).get("key_components", []),
+            key=lambda component: (-central.get(component["file"], 0.0), component["file"])
+        )
+        page, next_cursor = paginate_items(key_components, cursor, limit)
+        
+        return ORJSONResponse({
+            "items": [
+                {
+                    "file": component["file"],
+                    "description": analyzed.get(component["file"], {}).get("description"),
+                    "class_count": len(component.get("classes", [])),
+                    "function_count": len(component.get("functions", []))
+                }
+                for component in page
+            ],
+            "next_cursor": next_cursor,
+            "total": len(key_components)
+        })
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing components for {project_name}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/projects/{project_name}/components/{file_path:path}")
+async def get_project_component(project_name: str, file_path: str):
+    """Analyze a single component on demand, reusing earlier results."""
+    try:
+        if project_name not in processed_projects:
+            raise HTTPException(status_code=404, detail="Project not found")
+            
+        project = processed_projects[project_name]
+        analyzed = project.setdefault("components", {})
+        if file_path not in analyzed:
+            files_content = project.get("files_content", {})
+            if file_path not in files_content:
+                raise HTTPException(status_code=404, detail="File not found")
+            key = (project_name, project.get("version"), file_path)
+            components = await component_flight.run(
+                key, analyze_main_components, {file_path: files_content[file_path]}
+            )
+            if not components:
+                raise HTTPException(status_code=404, detail="File has no components")
+            _cache_components(project, [file_path], components)
+            if project_name in search_indexes:
+                search_indexes[project_name].update_file(file_path, component_documents(components[0]))
+            
+        return ORJSONResponse({"status": "success", "component": analyzed[file_path]})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error analyzing {file_path} in {project_name}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _export_project_site(project_name: str, project: Dict[str, Any]) -> Dict[str, Any]:
+    """Bring the static site of a project up to date with its current version."""
+    output_dir = site_path(project_name)
+    version = project.get("version")
+    site = project.get("site")
+    if site is not None and site["version"] == version:
+        return {**site["stats"], "rendered": 0, "unchanged": site["stats"]["pages"], "removed_files": 0}
+    
+    with project["files_content"].in_use() as files_content:
+        documentation = await _site_documentation(project_name, project, files_content)
+    stats = await asyncio.to_thread(export_site, documentation, output_dir)
+    project["site"] = {"version": version, "stats": stats}
+    return stats
+
+async def _site_documentation(project_name: str, project: Dict[str, Any], files_content: Dict[str, str]) -> Dict[str, Any]:
+    """Assemble the documentation to export from the cached component analysis.
+
+    Only Python files that were never analyzed or whose content changed
+    since are analyzed (and described by Gemini) again, so unchanged pages
+    keep their generated text and are not rendered again.
+    """
+    digests = project.get("component_digests", {})
+    stale = [
+        filename for filename in files_content
+        if filename.endswith('.py') and digests.get(filename) != files_content.digest(filename)
+    ]
+    import_names = project.setdefault("analysis_cache", {}).setdefault("import_names", {})
+    if stale:
+        components = await analyze_main_components(files_content, filenames=stale, import_names=import_names)
+        _cache_components(project, stale, components)
+        
+    # Cached components keep the centrality of the version they were analyzed in
+    centrality = compute_centrality(build_import_graph(files_content, import_names))
+    analyzed = project.get("components", {})
+    components = sorted(
+        (analyzed[filename] for filename in analyzed if filename in files_content),
+        key=lambda component: (-centrality.get(component["file"], 0.0), component["file"])
+    )
+    
+    # Reuse the Gemini recommendations while the metrics they were written for hold
+    code_quality = measure_code_quality(files_content)
+    previous = project.get("code_quality", {})
+    if previous.get("recommendations") and all(previous.get(key) == value for key, value in code_quality.items()):
+        code_quality["recommendations"] = previous["recommendations"]
+    
+    return {
+        "project_name": project_name,
+        "project_info": project.get("project_info", {}),
+        "analysis": {
+            "summary": await generate_project_summary(files_content),
+            "components": components,
+            "code_quality": code_quality
+        }
+    }
+
+@router.post("/projects/{project_name}/export")
+async def export_project_site(project_name: str):
+    """Render a project's documentation to a static Markdown and HTML site.
+
+    Only pages whose inputs changed since the previous export are written.
+    """
+    try:
+        if project_name not in processed_projects:
+            raise HTTPException(status_code=404, detail="Project not found")
+            
+        project = processed_projects[project_name]
+        stats = await site_flight.run(
+            (project_name, project.get("version")), _export_project_site, project_name, project
+        )
+        return {"status": "success", "project_name": project_name, **stats}
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting site for {project_name}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/projects/{project_name}/export.zip")
+async def download_project_site(project_name: str):
+    """Download a project's static documentation site as a zip archive."""
+    try:
+        if project_name not in processed_projects:
+            raise HTTPException(status_code=404, detail="Project not found")
+            
+        project = processed_projects[project_name]
+        await site_flight.run((project_name, project.get("version")), _export_project_site, project_name, project)
+        archive = await asyncio.to_thread(zip_site, site_path(project_name))
+        return FileResponse(archive, media_type="application/zip", filename=f"{project_name}-docs.zip")
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error archiving site for {project_name}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/projects/{project_name}/search")
+async def search_project(project_name: str, q: str, limit: int = 20):
+    """Search a project's files, classes and functions."""
+    if project_name not in search_indexes:
+        raise HTTPException(status_code=404, detail="Project not found")
+        
+    start = time.perf_counter()
+    results = search_indexes[project_name].search(q, limit=max(1, min(limit, 100)))
+    return {
+        "status": "success",
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+
+@router.get("/stats")
+async def get_stats():
+    """Report Gemini usage, model routing decisions and how many concurrent requests were coalesced."""
+    return {
+        "llm": llm.get_stats(),
+        "routing": model_routing.get_stats(),
+        "documentation": documentation_flight.get_stats(),
+        "components": component_flight.get_stats(),
+        "site_export": site_flight.get_stats(),
+        "content_store": content_store.get_stats()
+    }
+
 @router.delete("/projects/{project_name}")
 async def delete_project(project_name: str):
     """Delete a project."""
@@ -148,6 +549,14 @@ async def delete_project(project_name: str):
             raise HTTPException(status_code=404, detail="Project not found")
             
         del processed_projects[project_name]
+        content_store.remove_project(project_name)
+        search_indexes.pop(project_name, None)
+        try:
+            shutil.rmtree(site_path(project_name), ignore_errors=True)
+            site_path(project_name, '.zip').unlink(missing_ok=True)
+        except ValueError:
+            # The name cannot have an exported site
+            pass
         return {"status": "success", "message": f"Project {project_name} deleted"}
         
     except Exception as e:
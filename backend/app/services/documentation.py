@@ -1,56 +1,177 @@
-import google.generativeai as genai
 import os
-from dotenv import load_dotenv
 import ast
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 import json
 import re
+import time
+from app.services import model_routing
+from app.services.llm import generate_text
+from app.utils.file_classifier import sample_content, summarize_exclusions
+from app.utils.import_graph import build_import_graph, compute_centrality, find_entry_points
 
-# Load environment variables
-load_dotenv()
-
-# Configure Gemini API
-genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-model = genai.GenerativeModel('gemini-pro')
+# Number of most central modules described by Gemini, 0 means no limit
+LLM_TOP_K = int(os.getenv('DOCGEN_LLM_TOP_K', 25))
 
 logger = logging.getLogger(__name__)
 
-async def process_project(files_content: Dict[str, str]) -> Dict[str, Any]:
-    """Process project files and generate documentation."""
+async def process_project(files_content: Dict[str, str], excluded_files: Optional[Dict[str, str]] = None, analysis_cache: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Process project files and generate documentation.
+
+    Files listed in excluded_files (path -> reason) were skipped or sampled
+    at ingestion, the project info reports them rolled up per reason and
+    directory (see summarize_exclusions). analysis_cache, when
+    given, is filled with per-file results that update_project reuses.
+    """
     try:
         # First, log what we're processing
         logger.info(f"Processing project with {len(files_content)} files")
         
         # Generate all required information
         description = await generate_project_description(files_content)
-        technologies = await identify_technologies(files_content)
-        dependencies = await extract_dependencies(files_content)
-        
-        logger.info(f"Found technologies: {technologies}")
-        logger.info(f"Found dependencies: {dependencies}")
-        
-        project_info = {
-            "description": description,
-            "technologies": technologies,
-            "dependencies": dependencies,
-            "entry_points": await identify_entry_points(files_content),
-            "key_components": await extract_key_components(files_content)
-        }
+        project_info = await analyze_project_structure(files_content, excluded_files, analysis_cache)
         
         return {
-            "project_info": project_info,
+            "project_info": {"description": description, **project_info},
             "status": "success"
         }
     except Exception as e:
         logger.error(f"Error in process_project: {str(e)}")
         return {"status": "error", "error": str(e)}
 
+async def analyze_project_structure(files_content: Dict[str, str], excluded_files: Optional[Dict[str, str]] = None, analysis_cache: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Compute the project info that needs no Gemini call.
+
+    This is the CPU-bound part of process_project (technology scan, import
+    graph, PageRank, AST parsing), so batch callers can run it in worker
+    processes.
+    """
+    analysis_cache = analysis_cache if analysis_cache is not None else {}
+    technologies = await identify_technologies(files_content, analysis_cache.setdefault("technologies", {}))
+    dependencies = await extract_dependencies(files_content)
+    
+    logger.info(f"Found technologies: {technologies}")
+    logger.info(f"Found dependencies: {dependencies}")
+    
+    import_graph = build_import_graph(files_content, analysis_cache.setdefault("import_names", {}))
+    
+    return {
+        "technologies": technologies,
+        "dependencies": dependencies,
+        "entry_points": await identify_entry_points(files_content, import_graph),
+        "central_modules": rank_central_modules(import_graph),
+        "key_components": await extract_key_components(files_content),
+        "excluded_files": summarize_exclusions(excluded_files or {})
+    }
+
+async def update_project(
+    files_content: Dict[str, str],
+    project_info: Dict[str, Any],
+    changed_files: Dict[str, str],
+    removed_files: List[str],
+    analysis_cache: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Apply changed and removed files to an already processed project.
+
+    files_content is updated in place. Only the changed files are parsed
+    again (per-file results are kept in analysis_cache), the project wide
+    views are rebuilt from those cached results and the Gemini project
+    description is kept as is.
+    """
+    analysis_cache = analysis_cache if analysis_cache is not None else {}
+    import_names = analysis_cache.setdefault("import_names", {})
+    technology_cache = analysis_cache.setdefault("technologies", {})
+    
+    for filename in list(removed_files) + list(changed_files.keys()):
+        # MutableMapping.pop would read (and decode) the old content first
+        if filename in files_content:
+            del files_content[filename]
+        import_names.pop(filename, None)
+        technology_cache.pop(filename, None)
+    files_content.update(changed_files)
+    
+    touched = set(changed_files) | set(removed_files)
+    key_components = [
+        component for component in project_info.get("key_components", [])
+        if component["file"] not in touched
+    ]
+    key_components.extend(await extract_key_components(changed_files))
+    
+    import_graph = build_import_graph(files_content, import_names)
+    logger.info(f"Updated project with {len(changed_files)} changed and {len(removed_files)} removed files")
+    
+    return {
+        **project_info,
+        "technologies": await identify_technologies(files_content, technology_cache),
+        "dependencies": await extract_dependencies(files_content),
+        "entry_points": await identify_entry_points(files_content, import_graph),
+        "central_modules": rank_central_modules(import_graph),
+        "key_components": key_components
+    }
+
+DOCUMENTATION_SECTIONS = ('summary', 'components', 'code_quality', 'file_structure')
+
+async def generate_documentation(
+    project_name: str,
+    files_content: Dict[str, str],
+    project_info: Dict[str, Any],
+    sections: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Assemble the documentation of a processed project.
+
+    sections limits which of DOCUMENTATION_SECTIONS are computed, by
+    default all of them are.
+    """
+    documentation = await prepare_documentation(project_name, files_content, project_info, sections)
+    return await complete_documentation(documentation, files_content)
+
+async def prepare_documentation(
+    project_name: str,
+    files_content: Dict[str, str],
+    project_info: Dict[str, Any],
+    sections: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Assemble the documentation of a project without its Gemini text.
+
+    This is the CPU-bound part: components routed to Gemini have no
+    description yet and code quality has no recommendations, which
+    complete_documentation adds. The CLI runs it in worker processes.
+    """
+    sections = DOCUMENTATION_SECTIONS if sections is None else sections
+    analysis = {}
+    if 'summary' in sections:
+        analysis["summary"] = await generate_project_summary(files_content)
+    if 'components' in sections:
+        analysis["components"] = await plan_components(files_content)
+    if 'code_quality' in sections:
+        analysis["code_quality"] = measure_code_quality(files_content)
+    
+    documentation = {
+        "project_name": project_name,
+        "project_info": project_info,
+        "analysis": analysis
+    }
+    if 'file_structure' in sections:
+        documentation["file_structure"] = {
+            name: {"type": "file"} for name in files_content.keys()
+        }
+    return documentation
+
+async def complete_documentation(documentation: Dict[str, Any], files_content: Dict[str, str]) -> Dict[str, Any]:
+    """Add the Gemini descriptions and recommendations to prepared documentation."""
+    analysis = documentation["analysis"]
+    if "components" in analysis:
+        await describe_components(analysis["components"], files_content)
+    if "code_quality" in analysis:
+        analysis["code_quality"] = await analyze_code_quality(files_content, analysis["code_quality"])
+    return documentation
+
 async def generate_project_description(files_content: Dict[str, str]) -> str:
     """Generate project description using Gemini AI."""
     try:
         # Create file summary
-        file_list = "\n".join([f"- {filename}" for filename in files_content.items()])
+        file_list = "\n".join([f"- {filename}" for filename in files_content.keys()])
         
         prompt = f"""
         Analyze this software project and provide a comprehensive description.
@@ -77,11 +198,11 @@ async def generate_project_description(files_content: Dict[str, str]) -> str:
         """
 
         # Get response from Gemini
-        response = model.generate_content(prompt)
+        text = await generate_text(prompt)
         
-        if response and response.text:
+        if text:
             logger.info("Successfully generated project description")
-            return response.text
+            return text
             
         logger.warning("Failed to generate description with Gemini")
         return "A software project with multiple components and features."
@@ -90,62 +211,81 @@ async def generate_project_description(files_content: Dict[str, str]) -> str:
         logger.error(f"Error in generate_project_description: {str(e)}")
         return "A software project with multiple components and features."
 
-async def identify_technologies(files_content: Dict[str, str]) -> List[str]:
-    """Identify technologies used in the project."""
+async def identify_technologies(files_content: Dict[str, str], technology_cache: Optional[Dict[str, List[str]]] = None) -> List[str]:
+    """Identify technologies used in the project.
+
+    technology_cache optionally keeps the technologies found per file so
+    only files missing from it are scanned again.
+    """
+    technologies = set()
+    # Iterate names only, content is read for cache misses
+    for filename in files_content.keys():
+        if technology_cache is None:
+            technologies.update(detect_file_technologies(filename, files_content[filename]))
+            continue
+        if filename not in technology_cache:
+            technology_cache[filename] = sorted(detect_file_technologies(filename, files_content[filename]))
+        technologies.update(technology_cache[filename])
+            
+    return list(technologies)
+
+def detect_file_technologies(filename: str, content: str) -> set:
+    """Identify technologies used in a single file."""
     technologies = set()
     
     # Check file extensions
-    for filename in files_content.keys():
-        ext = filename.split('.')[-1].lower() if '.' in filename else ''
-        if ext == 'py':
-            technologies.add('Python')
-        elif ext == 'js':
-            technologies.add('JavaScript')
-        elif ext == 'html':
-            technologies.add('HTML')
-        elif ext == 'css':
-            technologies.add('CSS')
-        elif ext == 'java':
-            technologies.add('Java')
-        elif ext == 'cpp' or ext == 'cc':
-            technologies.add('C++')
-        elif ext == 'go':
-            technologies.add('Go')
+    ext = filename.split('.')[-1].lower() if '.' in filename else ''
+    if ext == 'py':
+        technologies.add('Python')
+    elif ext == 'js':
+        technologies.add('JavaScript')
+    elif ext == 'html':
+        technologies.add('HTML')
+    elif ext == 'css':
+        technologies.add('CSS')
+    elif ext == 'java':
+        technologies.add('Java')
+    elif ext == 'cpp' or ext == 'cc':
+        technologies.add('C++')
+    elif ext == 'go':
+        technologies.add('Go')
             
     # Check content for common frameworks and libraries
-    for content in files_content.values():
-        content_lower = content.lower()
-        # Python frameworks
-        if 'django' in content_lower:
-            technologies.add('Django')
-        if 'flask' in content_lower:
-            technologies.add('Flask')
-        if 'fastapi' in content_lower:
-            technologies.add('FastAPI')
-        if 'streamlit' in content_lower:
-            technologies.add('Streamlit')
-        # JavaScript frameworks
-        if 'react' in content_lower:
-            technologies.add('React')
-        if 'vue' in content_lower:
-            technologies.add('Vue.js')
-        if 'angular' in content_lower:
-            technologies.add('Angular')
-        # Data science libraries
-        if 'pandas' in content_lower:
-            technologies.add('Pandas')
-        if 'numpy' in content_lower:
-            technologies.add('NumPy')
-        if 'tensorflow' in content_lower:
-            technologies.add('TensorFlow')
+    content_lower = content.lower()
+    # Python frameworks
+    if 'django' in content_lower:
+        technologies.add('Django')
+    if 'flask' in content_lower:
+        technologies.add('Flask')
+    if 'fastapi' in content_lower:
+        technologies.add('FastAPI')
+    if 'streamlit' in content_lower:
+        technologies.add('Streamlit')
+    # JavaScript frameworks
+    if 'react' in content_lower:
+        technologies.add('React')
+    if 'vue' in content_lower:
+        technologies.add('Vue.js')
+    if 'angular' in content_lower:
+        technologies.add('Angular')
+    # Data science libraries
+    if 'pandas' in content_lower:
+        technologies.add('Pandas')
+    if 'numpy' in content_lower:
+        technologies.add('NumPy')
+    if 'tensorflow' in content_lower:
+        technologies.add('TensorFlow')
             
-    return list(technologies)
+    return technologies
 
 async def extract_dependencies(files_content: Dict[str, str]) -> List[str]:
     """Extract project dependencies."""
     dependencies = set()
     
-    for filename, content in files_content.items():
+    # Only dependency manifests are read
+    manifests = ('requirements.txt', 'package.json', 'pom.xml', 'go.mod')
+    for filename in [name for name in files_content.keys() if name.lower() in manifests]:
+        content = files_content[filename]
         # Python dependencies
         if filename.lower() == 'requirements.txt':
             for line in content.split('\n'):
@@ -205,49 +345,137 @@ async def extract_key_components(files_content: Dict[str, str]) -> List[Dict[str
                 
     return components
 
-async def analyze_main_components(files_content: Dict[str, str]) -> List[Dict[str, Any]]:
-    """Analyze main components of the project."""
+async def analyze_main_components(
+    files_content: Dict[str, str],
+    top_k: Optional[int] = None,
+    filenames: Optional[List[str]] = None,
+    import_names: Optional[Dict[str, Optional[List[str]]]] = None
+) -> List[Dict[str, Any]]:
+    """Analyze main components of the project.
+
+    Components are ordered by their centrality in the import graph. Files
+    whose complexity score routes them to the template tier are described
+    from their docstrings and signatures, of the others only the top_k most
+    central ones (LLM_TOP_K by default) are described by Gemini and the
+    rest fall back to their module docstring.
+
+    filenames limits the analysis to some files (for example the ones a
+    sync changed), centrality is still computed over the whole project.
+    import_names is the per-file import cache of build_import_graph.
+    """
+    components = await plan_components(files_content, top_k, filenames, import_names)
+    return await describe_components(components, files_content)
+
+async def plan_components(
+    files_content: Dict[str, str],
+    top_k: Optional[int] = None,
+    filenames: Optional[List[str]] = None,
+    import_names: Optional[Dict[str, Optional[List[str]]]] = None
+) -> List[Dict[str, Any]]:
+    """Analyze and route the components of a project without calling Gemini.
+
+    Takes the arguments of analyze_main_components. Components routed to
+    Gemini are returned with a None description for describe_components.
+    """
     try:
+        top_k = LLM_TOP_K if top_k is None else top_k
+        centrality = compute_centrality(build_import_graph(files_content, import_names))
+        ranked_files = sorted(
+            (filename for filename in (files_content.keys() if filenames is None else filenames) if filename.endswith('.py')),
+            key=lambda filename: (-centrality.get(filename, 0.0), filename)
+        )
+
         components = []
-        for filename, content in files_content.items():
-            if filename.endswith('.py'):
-                # Extract classes and functions
-                classes = await extract_classes(content)
-                functions = await extract_functions(content)
-                
-                # Generate component description using Gemini
-                prompt = f"""
-                Analyze this Python file and provide a brief description of its purpose and functionality:
-
-                Filename: {filename}
-                Content:
-                {content}
-
-                Focus on:
-                1. Main purpose of this file
-                2. Key functionality
-                3. How it integrates with other components
-                
-                Keep the response concise (2-3 sentences).
-                """
-                
-                try:
-                    description = model.generate_content(prompt).text
-                except Exception:
-                    description = "No description available"
+        pending = 0
+        displaced = 0
+        for filename in ranked_files:
+            content = files_content[filename]
+            # Extract classes and functions
+            classes = await extract_classes(content)
+            functions = await extract_functions(content)
+            if not classes and not functions:
+                continue
+
+            complexity = model_routing.complexity_score(model_routing.complexity_metrics(content, classes, functions))
+            tier = model_routing.route(complexity)
+            # Files ahead of this one that would take the top_k budget without the template tier
+            budget_used = pending + displaced
+            if tier == 'template':
+                start = time.perf_counter()
+                description = model_routing.template_description(filename, content, classes, functions)
+                would_be_remote = top_k <= 0 or budget_used < top_k
+                displaced += would_be_remote
+                model_routing.record(tier, time.perf_counter() - start, displaced=would_be_remote)
+            elif tier == 'docstring' or (top_k > 0 and pending >= top_k):
+                tier = 'docstring'
+                start = time.perf_counter()
+                description = await extract_file_description(content)
+                model_routing.record(tier, time.perf_counter() - start)
+            else:
+                description = None
+                pending += 1
+                model_routing.record(tier)
+
+            components.append({
+                "file": filename,
+                "description": description,
+                "centrality": round(centrality.get(filename, 0.0), 6),
+                "complexity": complexity,
+                "tier": tier,
+                "classes": classes,
+                "functions": functions
+            })
 
-                if classes or functions:
-                    components.append({
-                        "file": filename,
-                        "description": description,
-                        "classes": classes,
-                        "functions": functions
-                    })
         return components
     except Exception as e:
         logger.error(f"Error analyzing components: {str(e)}")
         return []
 
+async def describe_components(components: List[Dict[str, Any]], files_content: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Describe the planned components without a description with Gemini, in place."""
+    pending = [component for component in components if component["description"] is None]
+    # Describe the selected components concurrently, the LLM layer caps parallelism
+    descriptions = await asyncio.gather(*(
+        describe_component(
+            component["file"],
+            files_content[component["file"]],
+            on_model_call=model_routing.record_remote_call
+        )
+        for component in pending
+    ))
+    for component, description in zip(pending, descriptions):
+        component["description"] = description
+    templated = sum(1 for component in components if component["tier"] == 'template')
+
+    logger.info(f"Described {len(pending)} of {len(components)} components with Gemini, {templated} from templates")
+    return components
+
+async def describe_component(filename: str, content: str, on_model_call: Optional[Callable[[float], None]] = None) -> str:
+    """Generate a short description of a Python file using Gemini.
+
+    Oversized files are sent as a head and tail sample. on_model_call is
+    passed on to generate_text to time the Gemini call.
+    """
+    prompt = f"""
+    Analyze this Python file and provide a brief description of its purpose and functionality:
+
+    Filename: {filename}
+    Content:
+    {sample_content(content)}
+
+    Focus on:
+    1. Main purpose of this file
+    2. Key functionality
+    3. How it integrates with other components
+    
+    Keep the response concise (2-3 sentences).
+    """
+    
+    try:
+        return await generate_text(prompt, on_model_call)
+    except Exception:
+        return "No description available"
+
 async def extract_file_description(content: str) -> str:
     """Extract a brief description from a file."""
     try:
@@ -259,6 +487,9 @@ async def extract_file_description(content: str) -> str:
         pass
     return "No description available"
 
+# Docstring stored by the analyzers for classes and functions without one
+MISSING_DOCSTRING = 'No documentation available'
+
 async def extract_classes(content: str) -> List[Dict[str, Any]]:
     """Extract class information from Python code."""
     classes = []
@@ -268,7 +499,7 @@ async def extract_classes(content: str) -> List[Dict[str, Any]]:
             if isinstance(node, ast.ClassDef):
                 class_info = {
                     'name': node.name,
-                    'docstring': ast.get_docstring(node) or 'No documentation available',
+                    'docstring': ast.get_docstring(node) or MISSING_DOCSTRING,
                     'methods': [method.name for method in node.body if isinstance(method, ast.FunctionDef)]
                 }
                 classes.append(class_info)
@@ -277,15 +508,25 @@ async def extract_classes(content: str) -> List[Dict[str, Any]]:
     return classes
 
 async def extract_functions(content: str) -> List[Dict[str, Any]]:
-    """Extract function information from Python code."""
+    """Extract function information from Python code.
+
+    Methods are included, their qualname is prefixed with their class name.
+    """
     functions = []
     try:
         tree = ast.parse(content)
+        owners = {
+            id(method): node.name
+            for node in ast.walk(tree) if isinstance(node, ast.ClassDef)
+            for method in node.body if isinstance(method, ast.FunctionDef)
+        }
         for node in ast.walk(tree):
             if isinstance(node, ast.FunctionDef):
+                owner = owners.get(id(node))
                 function_info = {
                     'name': node.name,
-                    'docstring': ast.get_docstring(node) or 'No documentation available',
+                    'qualname': f"{owner}.{node.name}" if owner else node.name,
+                    'docstring': ast.get_docstring(node) or MISSING_DOCSTRING,
                     'args': [arg.arg for arg in node.args.args]
                 }
                 functions.append(function_info)
@@ -293,37 +534,14 @@ async def extract_functions(content: str) -> List[Dict[str, Any]]:
         pass
     return functions
 
-async def analyze_code_quality(files_content: Dict[str, str]) -> Dict[str, Any]:
-    """Analyze code quality metrics."""
+async def analyze_code_quality(files_content: Dict[str, str], metrics: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Analyze code quality metrics.
+
+    metrics optionally holds measure_code_quality's result when it was
+    computed beforehand, for example in a worker process.
+    """
     try:
-        metrics = {
-            'total_lines': 0,
-            'code_lines': 0,
-            'comment_lines': 0,
-            'docstring_coverage': 0,
-            'complexity_analysis': {}
-        }
-        
-        total_functions = 0
-        documented_functions = 0
-        
-        for filename, content in files_content.items():
-            if filename.endswith('.py'):
-                lines = content.splitlines()
-                metrics['total_lines'] += len(lines)
-                metrics['code_lines'] += sum(1 for line in lines if line.strip() and not line.strip().startswith('#'))
-                metrics['comment_lines'] += sum(1 for line in lines if line.strip().startswith('#'))
-                
-                # Analyze functions and their documentation
-                tree = ast.parse(content)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        total_functions += 1
-                        if ast.get_docstring(node):
-                            documented_functions += 1
-        
-        if total_functions > 0:
-            metrics['docstring_coverage'] = (documented_functions / total_functions) * 100
+        metrics = measure_code_quality(files_content) if metrics is None else metrics
             
         # Generate code quality insights using Gemini
         prompt = f"""
@@ -337,7 +555,7 @@ async def analyze_code_quality(files_content: Dict[str, str]) -> Dict[str, Any]:
         """
         
         try:
-            metrics['recommendations'] = model.generate_content(prompt).text
+            metrics['recommendations'] = await generate_text(prompt)
         except Exception:
             metrics['recommendations'] = "No recommendations available"
             
@@ -351,6 +569,42 @@ async def analyze_code_quality(files_content: Dict[str, str]) -> Dict[str, Any]:
             'docstring_coverage': 0
         }
 
+def measure_code_quality(files_content: Dict[str, str]) -> Dict[str, Any]:
+    """Line counts and docstring coverage of the Python files, without Gemini recommendations."""
+    metrics = {
+        'total_lines': 0,
+        'code_lines': 0,
+        'comment_lines': 0,
+        'docstring_coverage': 0,
+        'complexity_analysis': {}
+    }
+    
+    total_functions = 0
+    documented_functions = 0
+    
+    for filename, content in files_content.items():
+        if filename.endswith('.py'):
+            lines = content.splitlines()
+            metrics['total_lines'] += len(lines)
+            metrics['code_lines'] += sum(1 for line in lines if line.strip() and not line.strip().startswith('#'))
+            metrics['comment_lines'] += sum(1 for line in lines if line.strip().startswith('#'))
+            
+            # Analyze functions and their documentation
+            try:
+                tree = ast.parse(content)
+            except SyntaxError:
+                logger.warning(f"Skipping docstring coverage for {filename}: not valid Python")
+                continue
+            for node in ast.walk(tree):
+                if isinstance(node, ast.FunctionDef):
+                    total_functions += 1
+                    if ast.get_docstring(node):
+                        documented_functions += 1
+    
+    if total_functions > 0:
+        metrics['docstring_coverage'] = (documented_functions / total_functions) * 100
+    return metrics
+
 def get_file_type(filename: str) -> str:
     """Determine file type from extension."""
     ext = filename.split('.')[-1].lower() if '.' in filename else ''
@@ -529,16 +783,30 @@ async def generate_project_summary(files_content: Dict[str, str]) -> str:
         return f"Project contains {len(files_content)} files."
 
 # Make sure these functions are also defined
-async def identify_entry_points(files_content: Dict[str, str]) -> List[str]:
-    """Identify main entry points of the project."""
-    entry_points = []
+async def identify_entry_points(files_content: Dict[str, str], import_graph: Optional[Dict[str, set]] = None) -> List[str]:
+    """Identify main entry points of the project from its import graph."""
+    if import_graph is None:
+        import_graph = build_import_graph(files_content)
+    entry_points = find_entry_points(import_graph, files_content)
     
-    for filename, content in files_content.items():
-        if any(name in filename.lower() for name in ['main', 'app', 'index']):
-            entry_points.append(filename)
+    # Fall back to well-known file names when the graph has no clear roots
+    if not entry_points:
+        entry_points = [
+            filename for filename in files_content.keys()
+            if any(name in filename.lower() for name in ['main', 'app', 'index'])
+        ]
             
     return entry_points
 
+def rank_central_modules(import_graph: Dict[str, set], limit: int = 10) -> List[Dict[str, Any]]:
+    """Return the most central modules of the import graph with their scores."""
+    centrality = compute_centrality(import_graph)
+    ranked = sorted(centrality.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [
+        {"file": filename, "centrality": round(score, 6), "imported_by": sum(filename in targets for targets in import_graph.values())}
+        for filename, score in ranked
+    ]
+
 async def extract_key_components(files_content: Dict[str, str]) -> List[Dict[str, Any]]:
     """Extract key components from the project."""
     components = []
@@ -554,13 +822,13 @@ async def extract_key_components(files_content: Dict[str, str]) -> List[Dict[str
                     if isinstance(node, ast.ClassDef):
                         classes.append({
                             'name': node.name,
-                            'docstring': ast.get_docstring(node) or 'No documentation available',
+                            'docstring': ast.get_docstring(node) or MISSING_DOCSTRING,
                             'methods': [method.name for method in node.body if isinstance(method, ast.FunctionDef)]
                         })
                     elif isinstance(node, ast.FunctionDef):
                         functions.append({
                             'name': node.name,
-                            'docstring': ast.get_docstring(node) or 'No documentation available',
+                            'docstring': ast.get_docstring(node) or MISSING_DOCSTRING,
                             'args': [arg.arg for arg in node.args.args]
                         })
                         
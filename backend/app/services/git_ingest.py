@@ -0,0 +1,204 @@
+import logging
+import os
+import posixpath
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.utils.file_classifier import IGNORE_FILENAMES
+
+logger = logging.getLogger(__name__)
+
+# Directories git-sync may read repositories and bundles from, separated by os.pathsep.
+# Unset means git-sync is disabled, API clients must not point the server at arbitrary paths.
+GIT_ROOTS = [root for root in os.getenv('DOCGEN_GIT_ROOTS', '').split(os.pathsep) if root]
+
+
+class GitError(Exception):
+    """Raised when a git command fails or a revision cannot be read."""
+
+
+class RepositoryNotAllowed(GitError):
+    """Raised for a repository path outside the configured GIT_ROOTS."""
+
+
+def allowed_repository(source: str, roots: Optional[List[str]] = None) -> str:
+    """Resolve a client supplied repository path, refusing paths outside the allowed roots."""
+    roots = GIT_ROOTS if roots is None else roots
+    if not roots:
+        raise RepositoryNotAllowed("git-sync is disabled, set DOCGEN_GIT_ROOTS to allow repositories")
+    path = os.path.realpath(source)
+    for root in roots:
+        root = os.path.realpath(root)
+        if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+            return path
+    raise RepositoryNotAllowed(f"Repository is outside the allowed roots: {source}")
+
+
+def _run_git(repo: str, args: List[str], input_data: Optional[bytes] = None) -> bytes:
+    """Run a git command against a repository and return its stdout."""
+    result = subprocess.run(
+        ['git', '-C', repo] + args,
+        input=input_data,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        raise GitError(result.stderr.decode('utf-8', errors='replace').strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+@contextmanager
+def open_repository(source: str) -> Iterator[str]:
+    """Yield a repository path for a local repository or a git bundle file.
+
+    Bundles are fetched into a temporary bare repository that is removed
+    afterwards.
+    """
+    if os.path.isdir(source):
+        yield source
+        return
+
+    if not os.path.isfile(source):
+        raise GitError(f"Repository not found: {source}")
+
+    temp_dir = tempfile.mkdtemp(prefix='docgen-bundle-')
+    try:
+        _run_git(temp_dir, ['init', '--bare', '--quiet'])
+        _run_git(temp_dir, ['fetch', '--quiet', os.path.abspath(source), '+refs/*:refs/*'])
+        yield temp_dir
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def resolve_revision(repo: str, revision: str) -> str:
+    """Resolve a revision name to a full commit id."""
+    return _run_git(repo, ['rev-parse', '--verify', '--quiet', f"{revision}^{{commit}}"]).decode().strip()
+
+
+def list_files(repo: str, revision: str) -> List[str]:
+    """List every file tracked at a revision."""
+    output = _run_git(repo, ['ls-tree', '-r', '-z', '--name-only', revision])
+    return [path.decode('utf-8', errors='replace') for path in output.split(b'\0') if path]
+
+
+def diff_files(repo: str, base: str, head: str) -> Tuple[List[str], List[str]]:
+    """Return the files changed (added or modified) and removed between two revisions.
+
+    Renames are reported as a removal plus an addition.
+    """
+    output = _run_git(repo, ['diff', '--name-status', '-z', '--no-renames', base, head])
+    fields = [field.decode('utf-8', errors='replace') for field in output.split(b'\0') if field]
+
+    changed, removed = [], []
+    for status, path in zip(fields[0::2], fields[1::2]):
+        if status.startswith('D'):
+            removed.append(path)
+        else:
+            changed.append(path)
+    return changed, removed
+
+
+def read_blobs(repo: str, revision: str, paths: List[str]) -> Dict[str, bytes]:
+    """Read file contents at a revision straight from the object database.
+
+    All blobs are streamed through a single 'git cat-file --batch' process
+    instead of checking out a working tree.
+    """
+    if not paths:
+        return {}
+
+    request = ''.join(f"{revision}:{path}\n" for path in paths).encode('utf-8')
+    output = _run_git(repo, ['cat-file', '--batch'], input_data=request)
+
+    blobs = {}
+    offset = 0
+    for path in paths:
+        header_end = output.index(b'\n', offset)
+        header = output[offset:header_end].split()
+        offset = header_end + 1
+        if header[-1] == b'missing' or len(header) < 3:
+            logger.debug(f"Blob missing at {revision}: {path}")
+            continue
+        size = int(header[2])
+        if header[1] == b'blob':
+            blobs[path] = output[offset:offset + size]
+        # Content is followed by a newline
+        offset += size + 1
+    return blobs
+
+
+def _ignore_file_candidates(paths: List[str]) -> List[str]:
+    """List the ignore files that could apply to the given paths."""
+    directories = {''}
+    for path in paths:
+        parts = path.split('/')[:-1]
+        directories.update('/'.join(parts[:i]) for i in range(1, len(parts) + 1))
+    return sorted(
+        f"{directory}/{name}" if directory else name
+        for directory in directories for name in IGNORE_FILENAMES
+    )
+
+
+def read_changes(source: str, head: str = 'HEAD', base: Optional[str] = None) -> Dict[str, object]:
+    """Read the files changed between base and head from a repository or bundle.
+
+    Without a base every file at head is read. Only blobs of changed files
+    (and the ignore files that apply to them) are loaded, so the work done
+    scales with the size of the diff. When an ignore file changed, every
+    file below its directory is read again so the new rules are applied.
+    """
+    with open_repository(source) as repo:
+        head_commit = resolve_revision(repo, head)
+        base_commit = resolve_revision(repo, base) if base else None
+        if base_commit:
+            changed, removed = diff_files(repo, base_commit, head_commit)
+            ignore_dirs = [
+                posixpath.dirname(path) for path in changed + removed
+                if posixpath.basename(path) in IGNORE_FILENAMES
+            ]
+            if ignore_dirs:
+                known = set(changed)
+                changed += [
+                    path for path in list_files(repo, head_commit)
+                    if path not in known and any(not directory or path.startswith(directory + '/') for directory in ignore_dirs)
+                ]
+        else:
+            changed, removed = list_files(repo, head_commit), []
+
+        ignore_files = {
+            path: blob.decode('utf-8', errors='replace')
+            for path, blob in read_blobs(repo, head_commit, _ignore_file_candidates(changed)).items()
+        }
+        blobs = read_blobs(repo, head_commit, changed)
+
+    logger.info(f"Read {len(blobs)} changed and {len(removed)} removed files at {head_commit[:12]}")
+    return {
+        "head": head_commit,
+        "base": base_commit,
+        "blobs": blobs,
+        "removed": removed,
+        "ignore_files": ignore_files
+    }
+
+
+def merge_changed_files(
+    excluded_files: Dict[str, str],
+    changed_paths: List[str],
+    removed_paths: List[str],
+    files_content: Dict[str, str],
+    changed_excluded: Dict[str, str]
+) -> Tuple[List[str], Dict[str, str]]:
+    """Fold a decoded diff into a project's exclusions.
+
+    changed_paths are the paths read from the diff, of which files_content
+    holds the analyzable ones and changed_excluded the excluded ones.
+    Returns the files to drop from the project (removed, or changed but now
+    excluded) and the updated path -> reason map of excluded files.
+    """
+    touched = set(changed_paths) | set(removed_paths)
+    dropped = list(removed_paths) + [path for path in changed_paths if path not in files_content]
+    merged = {path: reason for path, reason in excluded_files.items() if path not in touched}
+    merged.update(changed_excluded)
+    return dropped, merged
@@ -0,0 +1,123 @@
+import logging
+import os
+import posixpath
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import chardet
+from app.utils.file_classifier import (
+    IGNORE_FILENAMES,
+    classify_directory,
+    classify_path,
+    filter_project_files,
+    is_ignored,
+    parse_ignore_file
+)
+
+logger = logging.getLogger(__name__)
+
+BINARY_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.pyc', '.zip')
+
+# Number of bytes used to guess a file's encoding
+CHARDET_SAMPLE_BYTES = 64 * 1024
+
+def decode_content(raw_data: bytes) -> str:
+    """Decode file bytes, detecting the encoding when it is not UTF-8."""
+    # Binary files contain NUL bytes early on, text files practically never do
+    if b'\0' in raw_data[:8192]:
+        return ""
+    try:
+        return raw_data.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+
+    # Detect the encoding from a prefix, scanning large files fully is slow
+    result = chardet.detect(raw_data[:CHARDET_SAMPLE_BYTES])
+    encoding = result['encoding'] if result['encoding'] else 'utf-8'
+    return raw_data.decode(encoding, errors='replace')
+
+def read_file_content(file_path: Path) -> str:
+    """Read file content with proper encoding detection."""
+    try:
+        # Skip binary files
+        if file_path.suffix.lower() in BINARY_SUFFIXES:
+            return ""
+
+        # Read the file in binary mode first
+        with open(file_path, 'rb') as file:
+            raw_data = file.read()
+
+        return decode_content(raw_data)
+    except Exception as e:
+        logger.warning(f"Could not read file {file_path}: {str(e)}")
+        return ""
+
+def read_project_directory(root: Path) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Read the analyzable files of a project directory.
+
+    Returns the file contents keyed by relative path and the files that were
+    ignored, excluded or sampled, mapped to the reason. Ignored and vendored
+    directories (.git, node_modules, ...) are not walked at all, they are
+    reported once as 'path/'.
+    """
+    files_content = {}
+    excluded_files = {}
+    ignore_rules = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        relative_dir = Path(dirpath).relative_to(root).as_posix()
+        relative_dir = '' if relative_dir == '.' else relative_dir
+
+        # A top-down walk reads each .gitignore/.docignore before the files its rules apply to
+        for name in IGNORE_FILENAMES:
+            if name in filenames:
+                ignore_rules.extend(parse_ignore_file(read_file_content(Path(dirpath) / name), relative_dir))
+
+        # Prune skipped directories in place so os.walk does not descend into them
+        kept = []
+        for name in sorted(dirnames):
+            relative_path = posixpath.join(relative_dir, name)
+            reason = 'ignored' if is_ignored(relative_path + '/', ignore_rules) else classify_directory(relative_path)
+            if reason:
+                excluded_files[relative_path + '/'] = reason
+            else:
+                kept.append(name)
+        dirnames[:] = kept
+
+        # Read the remaining files, skipping ignored, vendored and generated ones
+        for name in sorted(filenames):
+            relative_path = posixpath.join(relative_dir, name)
+            reason = 'ignored' if is_ignored(relative_path, ignore_rules) else classify_path(relative_path)
+            if reason:
+                excluded_files[relative_path] = reason
+                continue
+            content = read_file_content(Path(dirpath) / name)
+            if content:  # Only include files we could read
+                files_content[relative_path] = content
+
+    # Drop generated, minified and vendored files before analysis
+    files_content, filtered_files = filter_project_files(files_content)
+    excluded_files.update(filtered_files)
+    return files_content, excluded_files
+
+def decode_project_blobs(blobs: Dict[str, bytes], ignore_rules: Optional[List[Tuple[str, str]]] = None) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Decode raw file blobs (e.g. read from git) the same way as a directory."""
+    ignore_rules = ignore_rules or []
+    files_content = {}
+    excluded_files = {}
+    for path, raw_data in blobs.items():
+        reason = 'ignored' if is_ignored(path, ignore_rules) else classify_path(path)
+        if reason:
+            excluded_files[path] = reason
+            continue
+        if path.lower().endswith(BINARY_SUFFIXES):
+            continue
+        try:
+            content = decode_content(raw_data)
+        except Exception as e:
+            logger.warning(f"Could not decode {path}: {str(e)}")
+            continue
+        if content:
+            files_content[path] = content
+
+    files_content, filtered_files = filter_project_files(files_content)
+    excluded_files.update(filtered_files)
+    return files_content, excluded_files
@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+import google.generativeai as genai
+from dotenv import load_dotenv
+from app.utils.singleflight import SingleFlight
+
+# Load environment variables
+load_dotenv()
+
+# Configure Gemini API
+genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+model = genai.GenerativeModel('gemini-pro')
+
+# Maximum number of Gemini requests in flight across the whole process
+LLM_CONCURRENCY = int(os.getenv('DOCGEN_LLM_CONCURRENCY', 4))
+
+logger = logging.getLogger(__name__)
+
+_semaphore: Optional[asyncio.Semaphore] = None
+_stats = {"calls": 0, "errors": 0, "seconds": 0.0}
+
+# Identical prompts sent while one is already in flight share its response
+_flight = SingleFlight("llm")
+
+def set_concurrency(limit: int):
+    """Change the global cap on concurrent Gemini requests."""
+    global LLM_CONCURRENCY, _semaphore
+    LLM_CONCURRENCY = max(1, limit)
+    _semaphore = None
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    return _semaphore
+
+async def generate_text(prompt: str, on_model_call: Optional[Callable[[float], None]] = None) -> str:
+    """Send a prompt to Gemini and return the response text.
+
+    The blocking client call runs in a worker thread so the event loop
+    stays responsive, and at most LLM_CONCURRENCY calls run at once.
+    Concurrent calls with the same prompt are coalesced into one request.
+    Errors propagate to the caller, which picks its own fallback text.
+
+    on_model_call is called with the duration of a successful model call,
+    without the wait for a concurrency slot. It is not called when this
+    call joined one already in flight.
+    """
+    key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    return await _flight.run(key, _generate, prompt, on_model_call)
+
+async def _generate(prompt: str, on_model_call: Optional[Callable[[float], None]] = None) -> str:
+    async with _get_semaphore():
+        start = time.perf_counter()
+        try:
+            response = await asyncio.to_thread(model.generate_content, prompt)
+        except Exception:
+            _stats["errors"] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _stats["calls"] += 1
+            _stats["seconds"] += elapsed
+        if on_model_call is not None:
+            on_model_call(elapsed)
+        return response.text if response else ""
+
+def get_stats() -> Dict[str, Any]:
+    """Return counters for the Gemini calls made so far."""
+    return {
+        **_stats,
+        "seconds": round(_stats["seconds"], 3),
+        "coalesced": _flight.coalesced,
+        "concurrency": LLM_CONCURRENCY
+    }
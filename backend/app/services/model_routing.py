@@ -0,0 +1,215 @@
+import ast
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tiers as name:max_score, tried in order; the last tier takes every remaining file
+ROUTING_TIERS_SPEC = os.getenv('DOCGEN_ROUTING_TIERS', 'template:6,remote')
+
+# Tiers a file can be routed to, 'docstring' also takes the files past the LLM_TOP_K budget
+TIER_NAMES = ('template', 'remote', 'docstring')
+
+# Complexity score weights
+LINE_WEIGHT = 0.1      # per code line (not blank, not a comment)
+SYMBOL_WEIGHT = 0.5    # per class, function and method
+BRANCH_WEIGHT = 1.0    # per branch or loop
+
+BRANCH_NODES = (
+    ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try, ast.With, ast.AsyncWith,
+    ast.BoolOp, ast.IfExp, ast.comprehension, ast.ExceptHandler
+)
+
+_stats = {
+    "decisions": {tier: 0 for tier in TIER_NAMES},
+    "template_seconds": 0.0,
+    "docstring_seconds": 0.0,
+    # Template files that would otherwise have been described by Gemini
+    "displaced": 0,
+    # Gemini calls for remote descriptions, timed without semaphore or coalesced waits
+    "remote_calls": 0,
+    "remote_seconds": 0.0
+}
+
+
+def parse_tiers(spec: str) -> List[Tuple[str, Optional[float]]]:
+    """Parse a tier spec such as 'template:6,remote' into (name, max_score) pairs."""
+    tiers = []
+    for entry in (part.strip() for part in spec.split(',')):
+        if not entry:
+            continue
+        name, _, bound = entry.partition(':')
+        if name not in TIER_NAMES:
+            raise ValueError(f"Unknown routing tier: {name}")
+        tiers.append((name, float(bound) if bound else None))
+    if not tiers:
+        raise ValueError("At least one routing tier is required")
+    # The last tier has no upper bound so every file is routed somewhere
+    tiers[-1] = (tiers[-1][0], None)
+    return tiers
+
+
+ROUTING_TIERS = parse_tiers(ROUTING_TIERS_SPEC)
+
+
+def set_tiers(spec: str):
+    """Replace the routing tiers, for example when tuning against a stub model."""
+    global ROUTING_TIERS
+    ROUTING_TIERS = parse_tiers(spec)
+
+
+def complexity_metrics(content: str, classes: List[Dict[str, Any]], functions: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Size and branching metrics of a Python file."""
+    lines = content.splitlines()
+    code_lines = sum(1 for line in lines if line.strip() and not line.strip().startswith('#'))
+    try:
+        branches = sum(1 for node in ast.walk(ast.parse(content)) if isinstance(node, BRANCH_NODES))
+    except SyntaxError:
+        branches = 0
+    # functions already includes methods, the analyzers walk the whole tree
+    return {
+        "code_lines": code_lines,
+        "symbols": len(classes) + len(functions),
+        "branches": branches
+    }
+
+
+def complexity_score(metrics: Dict[str, int]) -> float:
+    return round(
+        metrics["code_lines"] * LINE_WEIGHT
+        + metrics["symbols"] * SYMBOL_WEIGHT
+        + metrics["branches"] * BRANCH_WEIGHT,
+        2
+    )
+
+
+def route(score: float, tiers: Optional[List[Tuple[str, Optional[float]]]] = None) -> str:
+    """Pick the first tier whose bound the score does not exceed."""
+    for name, max_score in tiers or ROUTING_TIERS:
+        if max_score is None or score <= max_score:
+            return name
+    return (tiers or ROUTING_TIERS)[-1][0]
+
+
+def _first_line(docstring: str) -> str:
+    # Imported here, documentation imports this module
+    from app.services.documentation import MISSING_DOCSTRING
+
+    if not docstring or docstring == MISSING_DOCSTRING:
+        return ''
+    return docstring.strip().split('\n')[0].rstrip('.')
+
+
+def _describe_symbols(singular: str, plural: str, symbols: List[str]) -> str:
+    if len(symbols) == 1:
+        return f"{singular} {symbols[0]}"
+    return f"{plural} {', '.join(symbols[:-1])} and {symbols[-1]}"
+
+
+def template_description(
+    filename: str,
+    content: str,
+    classes: List[Dict[str, Any]],
+    functions: List[Dict[str, Any]]
+) -> str:
+    """Describe a simple file from its module docstring and symbol signatures.
+
+    The placeholder the analyzers store for symbols without a docstring is
+    left out of the description.
+    """
+    sentences = []
+    try:
+        module_doc = ast.get_docstring(ast.parse(content))
+    except SyntaxError:
+        module_doc = None
+    if module_doc:
+        sentences.append(module_doc.strip().split('\n\n')[0].replace('\n', ' ').rstrip('.') + '.')
+
+    # Methods are described with their class, functions sharing a method's name are not
+    methods = {f"{class_info['name']}.{method}" for class_info in classes for method in class_info.get('methods', [])}
+    class_parts = []
+    for class_info in classes:
+        summary = _first_line(class_info.get('docstring', ''))
+        class_parts.append(f"`{class_info['name']}`" + (f" ({summary})" if summary else ""))
+    function_parts = []
+    for function_info in functions:
+        if function_info.get('qualname') in methods:
+            continue
+        summary = _first_line(function_info.get('docstring', ''))
+        signature = f"{function_info['name']}({', '.join(function_info.get('args', []))})"
+        function_parts.append(f"`{signature}`" + (f" ({summary})" if summary else ""))
+
+    defined = [
+        _describe_symbols(singular, plural, parts)
+        for singular, plural, parts in (('class', 'classes', class_parts), ('function', 'functions', function_parts))
+        if parts
+    ]
+    if defined:
+        sentences.append(f"`{filename}` defines {' and '.join(defined)}.")
+    return ' '.join(sentences) or f"`{filename}` has no documented symbols."
+
+
+def record(tier: str, seconds: float = 0.0, displaced: bool = False):
+    """Count one file routed to a tier.
+
+    For the template and docstring tiers, seconds is the time the
+    description took. For the template tier, displaced tells whether the
+    file would otherwise have been described by Gemini rather than falling
+    past the LLM_TOP_K budget.
+    """
+    _stats["decisions"][tier] += 1
+    if tier == 'template':
+        _stats["template_seconds"] += seconds
+        _stats["displaced"] += displaced
+    elif tier == 'docstring':
+        _stats["docstring_seconds"] += seconds
+
+
+def record_remote_call(seconds: float):
+    """Add the duration of one Gemini call made for a remote description."""
+    _stats["remote_calls"] += 1
+    _stats["remote_seconds"] += seconds
+
+
+def reset_stats():
+    for tier in TIER_NAMES:
+        _stats["decisions"][tier] = 0
+    _stats["template_seconds"] = 0.0
+    _stats["docstring_seconds"] = 0.0
+    _stats["displaced"] = 0
+    _stats["remote_calls"] = 0
+    _stats["remote_seconds"] = 0.0
+
+
+def snapshot_stats() -> Dict[str, Any]:
+    """Copy of the raw counters, to hand a worker process's decisions to merge_stats."""
+    return {**_stats, "decisions": dict(_stats["decisions"])}
+
+
+def merge_stats(stats: Dict[str, Any]):
+    """Add counters taken with snapshot_stats, for example in another process."""
+    for tier, count in stats["decisions"].items():
+        _stats["decisions"][tier] += count
+    for key in ("template_seconds", "docstring_seconds", "displaced", "remote_calls", "remote_seconds"):
+        _stats[key] += stats[key]
+
+
+def get_stats() -> Dict[str, Any]:
+    """Routing decisions per tier and the remote latency the template tier avoided.
+
+    Saved latency is estimated as the mean Gemini call time times the
+    number of template files that would otherwise have gone remote, minus
+    the template's own time.
+    """
+    mean_remote = _stats["remote_seconds"] / _stats["remote_calls"] if _stats["remote_calls"] else 0.0
+    saved = _stats["displaced"] * mean_remote - _stats["template_seconds"]
+    return {
+        "tiers": [{"name": name, "max_score": max_score} for name, max_score in ROUTING_TIERS],
+        "decisions": dict(_stats["decisions"]),
+        "seconds": {tier: round(_stats[f"{tier}_seconds"], 3) for tier in TIER_NAMES},
+        "remote_calls": _stats["remote_calls"],
+        "displaced_files": _stats["displaced"],
+        "mean_remote_seconds": round(mean_remote, 3),
+        "latency_saved_seconds": round(max(0.0, saved), 3)
+    }
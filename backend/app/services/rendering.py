@@ -0,0 +1,64 @@
+from typing import Any, Dict, List
+
+
+def _render_symbols(component: Dict[str, Any]) -> List[str]:
+    lines = []
+    for class_info in component.get('classes', []):
+        lines.append(f"- **class `{class_info['name']}`**: {class_info.get('docstring', '')}")
+        for method in class_info.get('methods', []):
+            lines.append(f"  - `{method}()`")
+    for function_info in component.get('functions', []):
+        args = ', '.join(function_info.get('args', []))
+        lines.append(f"- **`{function_info['name']}({args})`**: {function_info.get('docstring', '')}")
+    return lines
+
+
+def render_component_markdown(component: Dict[str, Any]) -> str:
+    """Render a single analyzed component as Markdown."""
+    lines = [f"## `{component['file']}`", ""]
+    if component.get('description'):
+        lines += [component['description'].strip(), ""]
+    lines += _render_symbols(component)
+    return "\n".join(lines) + "\n"
+
+
+def render_markdown(documentation: Dict[str, Any]) -> str:
+    """Render generated project documentation as a single Markdown document."""
+    info = documentation.get('project_info', {})
+    analysis = documentation.get('analysis', {})
+    lines = [f"# {documentation.get('project_name', 'Project')}", ""]
+
+    if info.get('description'):
+        lines += [info['description'].strip(), ""]
+
+    if info.get('technologies'):
+        lines += ["## Technologies", ""] + [f"- {tech}" for tech in sorted(info['technologies'])] + [""]
+
+    if info.get('dependencies'):
+        lines += ["## Dependencies", ""] + [f"- `{dep}`" for dep in sorted(info['dependencies'])] + [""]
+
+    if info.get('entry_points'):
+        lines += ["## Entry Points", ""] + [f"- `{entry}`" for entry in info['entry_points']] + [""]
+
+    if analysis.get('summary'):
+        lines += ["## Summary", "", "```", analysis['summary'], "```", ""]
+
+    if analysis.get('components'):
+        lines += ["# Components", ""]
+        for component in analysis['components']:
+            lines += [render_component_markdown(component)]
+
+    quality = analysis.get('code_quality')
+    if quality:
+        lines += [
+            "## Code Quality", "",
+            f"- Total lines: {quality.get('total_lines', 0)}",
+            f"- Code lines: {quality.get('code_lines', 0)}",
+            f"- Comment lines: {quality.get('comment_lines', 0)}",
+            f"- Docstring coverage: {quality.get('docstring_coverage', 0):.1f}%",
+            ""
+        ]
+        if quality.get('recommendations'):
+            lines += [quality['recommendations'].strip(), ""]
+
+    return "\n".join(lines)
@@ -0,0 +1,282 @@
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+import tempfile
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.rendering import render_component_markdown, render_markdown
+from app.utils.search_index import component_documents, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Directory holding one exported static site per project
+SITE_DIR = Path(os.getenv('DOCGEN_SITE_DIR', 'site_exports'))
+
+# Threads rendering and writing pages
+EXPORT_WORKERS = int(os.getenv('DOCGEN_EXPORT_WORKERS', 8))
+
+MANIFEST_NAME = '.manifest.json'
+
+# Bump when the page templates change so every page is rendered again
+RENDER_VERSION = 2
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+{nav}
+{body}
+</body>
+</html>
+"""
+
+Renderer = Callable[[Dict[str, Any]], Dict[str, str]]
+
+
+def page_slug(filename: str) -> str:
+    """File name of a component page, unique per source path.
+
+    The readable part can collide ('a/b.py' and 'a__b.py'), a short hash
+    of the path keeps slugs apart.
+    """
+    path = filename.replace('\\', '/')
+    readable = re.sub(r'[^A-Za-z0-9._-]+', '_', path.replace('/', '__'))
+    return f"{readable}-{hashlib.blake2b(path.encode('utf-8'), digest_size=4).hexdigest()}"
+
+
+def site_path(project_name: str, suffix: str = '') -> Path:
+    """Path of a project's exported site (or its archive with suffix '.zip') in SITE_DIR.
+
+    Raises ValueError for project names that would leave SITE_DIR, such as '..'.
+    """
+    root = SITE_DIR.resolve()
+    path = (root / f"{project_name}{suffix}").resolve()
+    if path.parent != root:
+        raise ValueError(f"Invalid project name for a site path: {project_name!r}")
+    return path
+
+
+def _html_text(text: str) -> str:
+    paragraphs = [part.strip() for part in re.split(r'\n\s*\n', text or '') if part.strip()]
+    return "\n".join(f"<p>{html.escape(part)}</p>" for part in paragraphs)
+
+
+def _html_list(items: List[str]) -> str:
+    return "<ul>\n" + "\n".join(f"<li>{item}</li>" for item in items) + "\n</ul>"
+
+
+def _render_component_page(component: Dict[str, Any]) -> Dict[str, str]:
+    slug = page_slug(component['file'])
+    symbols = []
+    for class_info in component.get('classes', []):
+        methods = ''.join(f"<li><code>{html.escape(method)}()</code></li>" for method in class_info.get('methods', []))
+        symbols.append(
+            f"<strong>class <code>{html.escape(class_info['name'])}</code></strong>: "
+            f"{html.escape(class_info.get('docstring', ''))}" + (f"<ul>{methods}</ul>" if methods else "")
+        )
+    for function_info in component.get('functions', []):
+        signature = f"{function_info['name']}({', '.join(function_info.get('args', []))})"
+        symbols.append(f"<strong><code>{html.escape(signature)}</code></strong>: {html.escape(function_info.get('docstring', ''))}")
+
+    body = f"<h1><code>{html.escape(component['file'])}</code></h1>\n{_html_text(component.get('description', ''))}"
+    if symbols:
+        body += "\n" + _html_list(symbols)
+    return {
+        f"components/{slug}.md": "[Index](../index.md)\n\n" + render_component_markdown(component),
+        f"components/{slug}.html": PAGE_TEMPLATE.format(
+            title=html.escape(component['file']),
+            nav='<nav><a href="../index.html">Index</a></nav>',
+            body=body
+        )
+    }
+
+
+def _render_index_page(inputs: Dict[str, Any]) -> Dict[str, str]:
+    documentation = {
+        "project_name": inputs["project_name"],
+        "project_info": inputs["project_info"],
+        "analysis": inputs["analysis"]
+    }
+    links = [f"- [`{file}`](components/{slug}.md): {summary}" for file, slug, summary in inputs["components"]]
+    markdown = render_markdown(documentation)
+    if links:
+        markdown += "\n# Components\n\n" + "\n".join(links) + "\n"
+
+    info = inputs["project_info"]
+    body = [f"<h1>{html.escape(inputs['project_name'])}</h1>", _html_text(info.get('description', ''))]
+    for title, key in (("Technologies", 'technologies'), ("Dependencies", 'dependencies'), ("Entry Points", 'entry_points')):
+        if info.get(key):
+            values = sorted(info[key]) if key != 'entry_points' else info[key]
+            body += [f"<h2>{title}</h2>", _html_list([f"<code>{html.escape(value)}</code>" for value in values])]
+    if inputs["analysis"].get('summary'):
+        body += ["<h2>Summary</h2>", f"<pre>{html.escape(inputs['analysis']['summary'])}</pre>"]
+    if inputs["components"]:
+        body += ["<h2>Components</h2>", _html_list([
+            f'<a href="components/{slug}.html"><code>{html.escape(file)}</code></a> {html.escape(summary)}'
+            for file, slug, summary in inputs["components"]
+        ])]
+    return {
+        "index.md": markdown,
+        "index.html": PAGE_TEMPLATE.format(
+            title=html.escape(inputs['project_name']),
+            nav='<nav><a href="index.html">Index</a></nav>',
+            body="\n".join(part for part in body if part)
+        )
+    }
+
+
+def _render_search_index(inputs: Dict[str, Any]) -> Dict[str, str]:
+    """Inverted index for client-side search: term -> [[document id, term frequency], ...]."""
+    postings = defaultdict(dict)
+    for doc_id, document in enumerate(inputs["documents"]):
+        for term in tokenize(f"{document['name']} {document['text']}"):
+            postings[term][doc_id] = postings[term].get(doc_id, 0) + 1
+    index = {
+        "documents": [
+            {"kind": document["kind"], "name": document["name"], "file": document["file"], "page": document["page"]}
+            for document in inputs["documents"]
+        ],
+        "terms": {term: sorted(docs.items()) for term, docs in sorted(postings.items())}
+    }
+    return {"search-index.json": json.dumps(index, separators=(',', ':'))}
+
+
+def plan_pages(documentation: Dict[str, Any]) -> Dict[str, Tuple[Dict[str, Any], Renderer]]:
+    """Map every page of the site to its inputs and the function rendering it."""
+    components = documentation.get('analysis', {}).get('components', []) or []
+    info = documentation.get('project_info', {})
+
+    pages = {}
+    for component in components:
+        pages[f"component:{component['file']}"] = (component, _render_component_page)
+
+    pages["index"] = ({
+        "project_name": documentation.get('project_name', 'Project'),
+        "project_info": {
+            key: info.get(key) for key in ('description', 'technologies', 'dependencies', 'entry_points')
+        },
+        "analysis": {
+            key: value for key, value in documentation.get('analysis', {}).items() if key != 'components'
+        },
+        # Only the first description line of each component is shown on the index
+        "components": [
+            (component['file'], page_slug(component['file']), (component.get('description') or '').strip().split('\n')[0])
+            for component in components
+        ]
+    }, _render_index_page)
+
+    documents = []
+    for component in components:
+        page = f"components/{page_slug(component['file'])}.html"
+        documents += [{**document, "page": page} for document in component_documents(component)]
+    pages["search"] = ({"documents": documents}, _render_search_index)
+    return pages
+
+
+def _input_hash(inputs: Dict[str, Any]) -> str:
+    data = json.dumps([RENDER_VERSION, inputs], sort_keys=True, default=list)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _write_atomic(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _load_manifest(output_dir: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        return json.loads((output_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def export_site(documentation: Dict[str, Any], output_dir: Path, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Render documentation to a static Markdown and HTML site in output_dir.
+
+    A manifest records a hash of each page's inputs, so pages whose inputs
+    did not change since the last export are not rendered or written
+    again and pages of removed components are deleted. Pages are rendered
+    and written by a thread pool.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+    pages = plan_pages(documentation)
+    hashes = {key: _input_hash(inputs) for key, (inputs, _) in pages.items()}
+
+    stale = [
+        key for key in pages
+        if key not in manifest
+        or manifest[key]["hash"] != hashes[key]
+        or not all((output_dir / path).exists() for path in manifest[key]["files"])
+    ]
+
+    def render(key: str) -> List[str]:
+        inputs, renderer = pages[key]
+        files = renderer(inputs)
+        for path, content in files.items():
+            _write_atomic(output_dir / path, content)
+        return sorted(files)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers or EXPORT_WORKERS)) as pool:
+        written = dict(zip(stale, pool.map(render, stale)))
+
+    # Files of removed pages, and files a re-rendered page no longer writes
+    obsolete = [path for key in set(manifest) - set(pages) for path in manifest[key]["files"]]
+    obsolete += [
+        path for key, files in written.items() if key in manifest
+        for path in manifest[key]["files"] if path not in files
+    ]
+    removed = 0
+    for path in obsolete:
+        try:
+            (output_dir / path).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    _write_atomic(output_dir / MANIFEST_NAME, json.dumps({
+        key: {"hash": hashes[key], "files": written[key] if key in written else manifest[key]["files"]}
+        for key in pages
+    }, indent=1, sort_keys=True))
+
+    logger.info(f"Exported {len(stale)} of {len(pages)} pages to {output_dir}, removed {removed} files")
+    return {
+        "pages": len(pages),
+        "rendered": len(stale),
+        "unchanged": len(pages) - len(stale),
+        "removed_files": removed
+    }
+
+
+def zip_site(output_dir: Path) -> Path:
+    """Archive an exported site next to its directory, reusing an up to date archive."""
+    archive = output_dir.parent / f"{output_dir.name}.zip"
+    manifest = output_dir / MANIFEST_NAME
+    if archive.exists() and manifest.exists() and archive.stat().st_mtime >= manifest.stat().st_mtime:
+        return archive
+
+    handle, temp_path = tempfile.mkstemp(dir=archive.parent, prefix='.tmp-', suffix='.zip')
+    os.close(handle)
+    with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for path in sorted(output_dir.rglob('*')):
+            if path.is_file() and path.name != MANIFEST_NAME and not path.name.startswith('.tmp-'):
+                zip_file.write(path, path.relative_to(output_dir).as_posix())
+    os.replace(temp_path, archive)
+    return archive
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import zipfile
+
+import pytest
+
+# The CLI imports the Gemini client through the documentation service
+pytest.importorskip('dotenv')
+pytest.importorskip('google.generativeai')
+
+from app import cli  # noqa: E402
+from app.services import llm  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def generate_content(self, prompt):
+        return FakeResponse('Generated text.')
+
+
+def write_repository(path):
+    (path / 'app').mkdir(parents=True)
+    (path / 'requirements.txt').write_text('fastapi==0.1\n')
+    (path / 'app' / 'main.py').write_text('from app import models\n\n\ndef run():\n    """Run it."""\n')
+    (path / 'app' / 'models.py').write_text('class User:\n    """A user."""\n')
+
+
+def test_load_repositories_from_directory_and_manifests(tmp_path):
+    (tmp_path / 'alpha').mkdir()
+    (tmp_path / 'beta.zip').write_bytes(b'')
+    (tmp_path / 'notes.txt').write_text('')
+    assert cli.load_repositories(tmp_path) == [('alpha', tmp_path / 'alpha'), ('beta', tmp_path / 'beta.zip')]
+
+    manifest = tmp_path / 'repos.json'
+    manifest.write_text(json.dumps(['alpha', {'name': 'b', 'path': 'beta.zip'}]))
+    assert cli.load_repositories(manifest) == [('alpha', tmp_path / 'alpha'), ('b', tmp_path / 'beta.zip')]
+
+    listing = tmp_path / 'repos.list'
+    listing.write_text('# repositories\nalpha\n\nbeta.zip\n')
+    assert cli.load_repositories(listing) == [('alpha', tmp_path / 'alpha'), ('beta', tmp_path / 'beta.zip')]
+
+
+def test_load_repositories_rejects_duplicate_names(tmp_path):
+    (tmp_path / 'foo').mkdir()
+    (tmp_path / 'foo.zip').write_bytes(b'')
+    with pytest.raises(ValueError, match='foo'):
+        cli.load_repositories(tmp_path)
+
+    manifest = tmp_path / 'repos.json'
+    manifest.write_text(json.dumps(['a/app', 'b/app']))
+    with pytest.raises(ValueError, match='app'):
+        cli.load_repositories(manifest)
+
+    # Explicit names tell them apart
+    manifest.write_text(json.dumps([{'name': 'a-app', 'path': 'a/app'}, 'b/app']))
+    assert [name for name, _ in cli.load_repositories(manifest)] == ['a-app', 'app']
+
+
+def test_analyze_repository_unpacks_archives(tmp_path):
+    write_repository(tmp_path / 'repo')
+    archive = tmp_path / 'repo.zip'
+    with zipfile.ZipFile(archive, 'w') as zf:
+        for path in (tmp_path / 'repo').rglob('*'):
+            zf.write(path, path.relative_to(tmp_path / 'repo'))
+
+    result = cli.analyze_repository('repo', archive)
+
+    assert set(result['files_content']) == {'requirements.txt', 'app/main.py', 'app/models.py'}
+    documentation = result['documentation']
+    assert 'description' not in documentation['project_info']
+    assert documentation['project_info']['dependencies']
+    # Static analysis is done, the Gemini text is left to the parent process
+    assert {component['file'] for component in documentation['analysis']['components']} == {'app/main.py', 'app/models.py'}
+    assert 'recommendations' not in documentation['analysis']['code_quality']
+    assert sum(result['routing']['decisions'].values()) == 2
+    assert set(result['seconds']) == set(cli.PROCESS_STAGES)
+
+
+def test_run_batch_reports_stage_throughput_and_latency(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm, 'model', FakeModel())
+    write_repository(tmp_path / 'repos' / 'demo')
+    output = tmp_path / 'out'
+    output.mkdir()
+
+    summary = asyncio.run(cli.run_batch(
+        cli.load_repositories(tmp_path / 'repos'), output, workers=2, formats=['json', 'markdown'], processes=1
+    ))
+
+    assert summary['repositories'] == [{'name': 'demo', 'status': 'success', 'files': 3}]
+    assert json.loads((output / 'demo.json').read_text())['project_info']['description'] == 'Generated text.'
+    assert (output / 'demo.md').read_text().startswith('# demo')
+    stages = summary['stages']
+    assert stages['ingest']['files'] == 3 and 'files_per_second' in stages['analyze']
+    assert 'mean_seconds' in stages['document'] and 'files_per_second' not in stages['document']
+    # Routing decisions made in the worker process are counted
+    assert sum(summary['routing']['decisions'].values()) == 2
+    assert all(component['description'] for component in json.loads((output / 'demo.json').read_text())['analysis']['components'])
@@ -0,0 +1,76 @@
+import os
+
+from app.utils.content_store import ContentStore
+
+
+def test_project_files_behave_like_a_dict_and_share_blobs(tmp_path):
+    store = ContentStore(spill_dir=str(tmp_path))
+    first = store.add_project('first', {'a.py': 'x = 1\n', 'b.py': 'print("héllo ✓")\n', 'copy.py': 'x = 1\n'})
+    second = store.add_project('second', {'vendored.py': 'x = 1\n'})
+
+    assert dict(first) == {'a.py': 'x = 1\n', 'b.py': 'print("héllo ✓")\n', 'copy.py': 'x = 1\n'}
+    assert 'a.py' in first and 'missing.py' not in first
+    assert store.get_stats()['blobs'] == 2
+    assert first.digest('copy.py') == second.digest('vendored.py') != first.digest('b.py')
+
+    first['a.py'] = 'x = 2\n'
+    del first['copy.py']
+    assert dict(first) == {'a.py': 'x = 2\n', 'b.py': 'print("héllo ✓")\n'}
+    assert second['vendored.py'] == 'x = 1\n'
+
+    store.remove_project('second')
+    assert store.get_stats()['blobs'] == 2
+
+
+def test_spill_cold_projects_to_memory_mapped_files(tmp_path):
+    store = ContentStore(spill_dir=str(tmp_path))
+    cold = store.add_project('cold', {'a.py': 'a' * 100, 'empty.py': '', 'shared.py': 'shared'})
+    hot = store.add_project('hot', {'shared.py': 'shared'})
+    hot['shared.py']
+
+    store.spill_cold(keep_hot=1)
+    assert cold.spill_file is not None and hot.spill_file is None
+    assert store.get_stats()['blobs'] == 1
+    assert dict(cold) == {'a.py': 'a' * 100, 'empty.py': '', 'shared.py': 'shared'}
+
+    # Updates after spilling go to the arena, reads see both
+    cold['new.py'] = 'new'
+    cold['a.py'] = 'a' * 100
+    assert cold['new.py'] == 'new' and cold['a.py'] == 'a' * 100
+
+    store.remove_project('cold')
+    store.remove_project('hot')
+    assert store.get_stats()['blobs'] == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_replaced_project_stays_readable_while_in_use(tmp_path):
+    store = ContentStore(spill_dir=str(tmp_path))
+    old = store.add_project('demo', {'a.py': 'old', 'shared.py': 'shared'})
+
+    with old.in_use():
+        new = store.add_project('demo', {'shared.py': 'shared'})
+        assert dict(old) == {'a.py': 'old', 'shared.py': 'shared'}
+        assert store.get_stats()['projects'] == 1 and store.get_stats()['blobs'] == 2
+
+    assert old.closed and len(old) == 0
+    assert dict(new) == {'shared.py': 'shared'}
+    assert store.get_stats()['blobs'] == 1
+
+    with new.in_use():
+        store.remove_project('demo')
+        store.spill_cold(keep_hot=0)
+        assert new['shared.py'] == 'shared'
+    assert store.get_stats()['blobs'] == 0
+
+
+def test_default_spill_dir_is_removed_on_close(monkeypatch):
+    monkeypatch.delenv('DOCGEN_SPILL_DIR', raising=False)
+    with ContentStore() as store:
+        store.add_project('cold', {'a.py': 'a'})
+        store.spill_cold(keep_hot=0)
+        spill_dir = store.spill_dir
+        assert os.listdir(spill_dir)
+
+    assert not os.path.exists(spill_dir)
+    assert store.get_stats()['projects'] == 0
@@ -0,0 +1,134 @@
+import asyncio
+from collections.abc import MutableMapping
+
+import pytest
+
+# The documentation service configures the Gemini client on import
+pytest.importorskip('dotenv')
+pytest.importorskip('google.generativeai')
+
+from app.services.documentation import measure_code_quality, update_project  # noqa: E402
+
+
+class CountingFiles(MutableMapping):
+    """Dict that records which contents were read, like a lazily decoded ProjectFiles."""
+
+    def __init__(self, files):
+        self.files = dict(files)
+        self.reads = set()
+
+    def __getitem__(self, path):
+        self.reads.add(path)
+        return self.files[path]
+
+    def __setitem__(self, path, content):
+        self.files[path] = content
+
+    def __delitem__(self, path):
+        del self.files[path]
+
+    def __contains__(self, path):
+        return path in self.files
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self.files)
+
+
+FILES = {
+    'requirements.txt': 'fastapi\n',
+    'app/__init__.py': '',
+    'app/main.py': 'from fastapi import FastAPI\nfrom app import util\n\nif __name__ == "__main__":\n    util.helper()\n',
+    'app/util.py': 'def helper():\n    """Help."""\n',
+    'app/old.py': 'def old():\n    pass\n',
+}
+
+
+def test_update_project_reads_only_changed_files_and_manifests():
+    files = CountingFiles({})
+    cache = {}
+    info = asyncio.run(update_project(files, {'description': 'Demo.'}, dict(FILES), [], cache))
+    assert info['entry_points'] == ['app/main.py']
+    assert {component['file'] for component in info['key_components']} == {'app/util.py', 'app/old.py'}
+
+    files.reads.clear()
+    changed = {'app/util.py': 'class Helper:\n    """Help with Flask."""\n'}
+    info = asyncio.run(update_project(files, info, changed, ['app/old.py'], cache))
+
+    assert 'app/old.py' not in files and files['app/util.py'] == changed['app/util.py']
+    assert info['description'] == 'Demo.'
+    assert {component['file'] for component in info['key_components']} == {'app/util.py'}
+    assert set(info['technologies']) == {'Python', 'FastAPI', 'Flask'}
+    assert info['dependencies'] == ['fastapi']
+    # Unchanged modules are served from the per-file caches
+    assert 'app/main.py' not in files.reads
+    assert files.reads <= {'requirements.txt', 'app/__init__.py', 'app/util.py'}
+
+
+def test_measure_code_quality_counts_python_lines_and_docstrings():
+    metrics = measure_code_quality({**FILES, 'broken.py': 'def (:\n'})
+
+    assert metrics['total_lines'] == 10 and metrics['code_lines'] == 9
+    assert metrics['docstring_coverage'] == 50.0
+    assert 'recommendations' not in metrics
+
+
+def test_routing_credits_only_templates_within_the_remote_budget(monkeypatch):
+    from app.services import llm, model_routing
+    from app.services.documentation import analyze_main_components
+
+    class FakeModel:
+        def generate_content(self, prompt):
+            return type('Response', (), {'text': 'Described.'})()
+
+    monkeypatch.setattr(llm, 'model', FakeModel())
+    branchy = 'def run(items):\n' + ''.join(f'    if items[{n}]:\n        for item in items:\n            pass\n' for n in range(6))
+    files = {
+        'a_complex.py': branchy,
+        'b_simple.py': 'def one():\n    """One."""\n',
+        'c_simple.py': 'def two():\n    """Two."""\n',
+    }
+    model_routing.reset_stats()
+
+    components = asyncio.run(analyze_main_components(files, top_k=2))
+
+    assert [component['tier'] for component in components] == ['remote', 'template', 'template']
+    stats = model_routing.get_stats()
+    # Only b_simple.py would have fit the budget of two Gemini descriptions
+    assert stats['displaced_files'] == 1 and stats['remote_calls'] == 1
+    model_routing.reset_stats()
+
+
+def test_files_past_the_remote_budget_are_recorded_as_docstring(monkeypatch):
+    from app.services import llm, model_routing
+    from app.services.documentation import analyze_main_components
+
+    class FakeModel:
+        def generate_content(self, prompt):
+            return type('Response', (), {'text': 'Described.'})()
+
+    monkeypatch.setattr(llm, 'model', FakeModel())
+    branchy = 'def run(items):\n' + ''.join(f'    if items[{n}]:\n        for item in items:\n            pass\n' for n in range(6))
+    files = {'a.py': branchy, 'b.py': '"""Second module."""\n' + branchy}
+    model_routing.reset_stats()
+
+    components = asyncio.run(analyze_main_components(files, top_k=1))
+
+    assert [(component['tier'], component['description']) for component in components] == [
+        ('remote', 'Described.'), ('docstring', 'Second module.')
+    ]
+    stats = model_routing.get_stats()
+    assert stats['decisions'] == {'template': 0, 'remote': 1, 'docstring': 1}
+    assert 'docstring' in stats['seconds']
+    model_routing.reset_stats()
+
+
+def test_extract_functions_qualifies_methods_with_their_class():
+    from app.services.documentation import extract_functions
+
+    content = 'class Slug:\n    def render(self):\n        pass\n\n\ndef render(slug):\n    pass\n'
+    functions = asyncio.run(extract_functions(content))
+
+    assert sorted(function['qualname'] for function in functions) == ['Slug.render', 'render']
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from app.utils import file_classifier
+from app.utils.file_classifier import (
+    classify_directory,
+    classify_file,
+    filter_project_files,
+    is_ignored,
+    load_ignore_rules,
+    sample_content,
+    summarize_exclusions,
+    SAMPLE_HEAD_LINES,
+    SAMPLE_TAIL_LINES
+)
+
+
+def test_classify_file():
+    assert classify_file('src/app.py', 'import os\n') is None
+    assert classify_file('node_modules/react/index.js', 'module.exports = {}') == 'vendored'
+    assert classify_file('package-lock.json', '{}') == 'generated'
+    assert classify_file('api_pb2.py', '') == 'generated'
+    assert classify_file('models.py', '# Code generated by protoc. DO NOT EDIT.\n') == 'generated'
+    assert classify_file('static/app.min.js', 'var a=1;') == 'minified'
+    assert classify_file('static/bundle.js', 'var a=1;' * 1000) == 'minified'
+    assert classify_file('data.py', 'x = 1\n' * 10_000) == 'oversized'
+
+
+def test_generated_markers_only_count_in_leading_comments():
+    assert classify_file('api.go', '// Code generated by protoc-gen-go. DO NOT EDIT.\npackage api\n') == 'generated'
+    assert classify_file('schema.ts', '/*\n * @generated\n */\nexport {}\n') == 'generated'
+    assert classify_file('gen.py', '#!/usr/bin/env python\n# This file is generated, do not edit.\nx = 1\n') == 'generated'
+    assert classify_file('report.py', '"""Upload reports generated by the nightly job."""\n') is None
+    assert classify_file('urls.py', '# Do not edit this list by hand\nURLS = []\n') is None
+    assert classify_file('late.py', 'x = 1\n# @generated\n') is None
+    # The classifier's own source names every marker in string literals
+    assert classify_file('file_classifier.py', Path(file_classifier.__file__).read_text()) is None
+
+
+def test_build_directories_are_vendored_only_at_the_root():
+    assert classify_file('dist/app.js', 'var a = 1;\n') == 'vendored'
+    assert classify_file('build/lib/app.py', 'x = 1\n') == 'vendored'
+    assert classify_file('src/dist/app.py', 'x = 1\n') is None
+    assert classify_directory('build') == 'vendored'
+    assert classify_directory('src/build') is None
+    assert classify_directory('src/node_modules') == 'vendored'
+
+
+def test_ignore_rules():
+    rules = load_ignore_rules({
+        '.docignore': 'docs/\n*.log\n# comment\n!keep.log\n/fixtures',
+        'pkg/.gitignore': 'secret.py',
+    })
+    assert is_ignored('docs/index.md', rules)
+    assert is_ignored('server/debug.log', rules)
+    assert not is_ignored('keep.log', rules)
+    assert is_ignored('fixtures/data.json', rules)
+    assert not is_ignored('tests/fixtures/data.json', rules)
+    assert is_ignored('pkg/secret.py', rules)
+    assert not is_ignored('secret.py', rules)
+    assert not is_ignored('src/docs.py', rules)
+
+
+def test_filter_project_files_keeps_oversized_in_full():
+    big = '\n'.join(f'line_{i} = {i}' for i in range(20_000))
+    analyzable, excluded = filter_project_files({
+        'main.py': 'print("hi")',
+        'big.py': big,
+        'yarn.lock': '',
+    })
+    assert excluded == {'big.py': 'oversized', 'yarn.lock': 'generated'}
+    assert analyzable['main.py'] == 'print("hi")'
+    # The AST stages see the whole file, only LLM prompts use the sample
+    assert analyzable['big.py'] == big
+    assert len(sample_content(big).splitlines()) == SAMPLE_HEAD_LINES + SAMPLE_TAIL_LINES + 1
+
+
+def test_summarize_exclusions_rolls_up_by_reason_and_directory():
+    summary = summarize_exclusions({
+        '.git/': 'vendored',
+        'app/__pycache__/': 'vendored',
+        'app/api_pb2.py': 'generated',
+        'yarn.lock': 'generated',
+    })
+    assert summary == {
+        'counts': {'generated': 2, 'vendored': 2},
+        'directories': {'.': {'generated': 1}, '.git': {'vendored': 1}, 'app': {'generated': 1, 'vendored': 1}},
+    }
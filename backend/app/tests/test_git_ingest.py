@@ -0,0 +1,96 @@
+import subprocess
+
+import pytest
+
+from app.services.git_ingest import RepositoryNotAllowed, allowed_repository, merge_changed_files, read_changes
+
+
+def _git(repo, *args):
+    subprocess.run(['git', '-C', str(repo)] + list(args), check=True, capture_output=True)
+
+
+def _commit(repo, message):
+    _git(repo, 'add', '-A')
+    _git(repo, '-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-q', '-m', message)
+
+
+def test_read_changes_reads_only_the_diff(tmp_path):
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    _git(repo, 'init', '-q')
+    (repo / 'app').mkdir()
+    (repo / 'app' / 'main.py').write_text('import app.util\n')
+    (repo / 'app' / 'util.py').write_text('def helper():\n    pass\n')
+    (repo / 'old.py').write_text('x = 1\n')
+    (repo / '.docignore').write_text('*.log\n')
+    _commit(repo, 'first')
+
+    full = read_changes(str(repo))
+    assert sorted(full['blobs']) == ['.docignore', 'app/main.py', 'app/util.py', 'old.py']
+    assert full['ignore_files'] == {'.docignore': '*.log\n'}
+
+    (repo / 'app' / 'util.py').write_text('def helper():\n    return 1\n')
+    (repo / 'old.py').unlink()
+    _commit(repo, 'second')
+
+    diff = read_changes(str(repo), 'HEAD', 'HEAD~1')
+    assert diff['base'] == full['head']
+    assert diff['blobs'] == {'app/util.py': b'def helper():\n    return 1\n'}
+    assert diff['removed'] == ['old.py']
+    assert diff['ignore_files'] == {'.docignore': '*.log\n'}
+
+
+def test_read_changes_from_bundle(tmp_path):
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    _git(repo, 'init', '-q')
+    (repo / 'main.py').write_text('print("hi")\n')
+    _commit(repo, 'first')
+    bundle = tmp_path / 'repo.bundle'
+    _git(repo, 'bundle', 'create', str(bundle), '--all')
+
+    changes = read_changes(str(bundle))
+    assert changes['blobs'] == {'main.py': b'print("hi")\n'}
+
+
+def test_changed_ignore_file_rereads_files_below_it(tmp_path):
+    repo = tmp_path / 'repo'
+    (repo / 'pkg').mkdir(parents=True)
+    _git(repo, 'init', '-q')
+    (repo / 'pkg' / 'keep.py').write_text('x = 1\n')
+    (repo / 'pkg' / 'gen.py').write_text('y = 2\n')
+    (repo / 'top.py').write_text('z = 3\n')
+    _commit(repo, 'first')
+
+    (repo / 'pkg' / '.docignore').write_text('gen.py\n')
+    _commit(repo, 'ignore generated code')
+
+    diff = read_changes(str(repo), 'HEAD', 'HEAD~1')
+    assert sorted(diff['blobs']) == ['pkg/.docignore', 'pkg/gen.py', 'pkg/keep.py']
+    assert diff['ignore_files'] == {'pkg/.docignore': 'gen.py\n'}
+
+
+def test_merge_changed_files():
+    dropped, excluded = merge_changed_files(
+        {'dist/app.min.js': 'minified', 'pkg/gen.py': 'generated', 'old.py': 'oversized'},
+        ['pkg/gen.py', 'pkg/new.py', 'pkg/ignored.py'],
+        ['old.py', 'gone.py'],
+        {'pkg/gen.py': 'x = 1\n', 'pkg/new.py': 'y = 2\n'},
+        {'pkg/ignored.py': 'ignored'}
+    )
+    # Removed files and changed files that are now excluded leave the project
+    assert dropped == ['old.py', 'gone.py', 'pkg/ignored.py']
+    assert excluded == {'dist/app.min.js': 'minified', 'pkg/ignored.py': 'ignored'}
+
+
+def test_allowed_repository_stays_under_configured_roots(tmp_path):
+    root = tmp_path / 'repos'
+    (root / 'demo').mkdir(parents=True)
+    (tmp_path / 'repos-other').mkdir()
+
+    assert allowed_repository(str(root / 'demo'), [str(root)]) == str((root / 'demo').resolve())
+    for source in (str(root / 'demo' / '..' / '..'), str(tmp_path / 'repos-other'), '/etc'):
+        with pytest.raises(RepositoryNotAllowed):
+            allowed_repository(source, [str(root)])
+    with pytest.raises(RepositoryNotAllowed):
+        allowed_repository(str(root / 'demo'), [])
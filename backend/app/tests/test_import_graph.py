@@ -0,0 +1,60 @@
+from app.utils.import_graph import build_import_graph, compute_centrality, find_entry_points
+
+
+FILES = {
+    'backend/requirements.txt': 'fastapi\n',
+    'backend/app/main.py': 'from app.routers import project\nfrom .config import settings\n',
+    'backend/app/config.py': 'settings = {}\n',
+    'backend/app/routers/__init__.py': '',
+    'backend/app/routers/project.py': 'from app.services.documentation import process_project\nimport json\n',
+    'backend/app/services/documentation.py': 'from ..config import settings\n',
+    'backend/app/tests/test_docs.py': 'from app.services import documentation\n',
+    'scripts/run.py': 'if __name__ == "__main__":\n    pass\n',
+    'src/index.js': "import React from 'react';\nimport App from './App';\nconst api = require('./api');\n",
+    'src/App.jsx': "import { Header } from './components';\n",
+    'src/api.js': '',
+    'src/components/index.js': "export * from './Header';\n",
+    'src/components/Header.jsx': '',
+}
+
+
+def test_build_import_graph_resolves_python_and_js_imports():
+    graph = build_import_graph(FILES)
+    assert graph['backend/app/main.py'] == {'backend/app/routers/project.py', 'backend/app/config.py'}
+    assert graph['backend/app/routers/project.py'] == {'backend/app/services/documentation.py'}
+    assert graph['backend/app/services/documentation.py'] == {'backend/app/config.py'}
+    assert graph['src/index.js'] == {'src/App.jsx', 'src/api.js'}
+    assert graph['src/App.jsx'] == {'src/components/index.js'}
+    assert graph['src/components/index.js'] == {'src/components/Header.jsx'}
+
+
+def test_centrality_and_entry_points():
+    graph = build_import_graph(FILES)
+    centrality = compute_centrality(graph)
+    assert abs(sum(centrality.values()) - 1.0) < 1e-6
+    assert max(centrality, key=centrality.get) == 'backend/app/config.py'
+    assert find_entry_points(graph, FILES) == ['src/index.js', 'backend/app/main.py', 'scripts/run.py']
+
+
+def test_asset_imports_are_not_edges():
+    graph = build_import_graph({
+        'src/index.js': "import './index.css';\nimport data from './data.json';\n",
+        'src/index.css': 'body {}',
+        'src/data.json': '{}',
+    })
+    assert graph == {'src/index.js': set()}
+
+
+def test_imports_resolve_only_from_project_roots():
+    graph = build_import_graph({
+        'app/__init__.py': '',
+        'app/main.py': 'import logging\nimport json\nfrom app import utils\nfrom app.utils import helpers, missing\n',
+        'app/utils/__init__.py': '',
+        'app/utils/logging.py': 'import logging\n',
+        'app/utils/helpers.py': 'from app.utils import logging\n',
+        'scripts/json.py': '',
+    })
+    # Neither stdlib module resolves to a project file, a resolved submodule adds no package edge
+    assert graph['app/main.py'] == {'app/utils/__init__.py', 'app/utils/helpers.py'}
+    assert graph['app/utils/logging.py'] == set()
+    assert graph['app/utils/helpers.py'] == {'app/utils/logging.py'}
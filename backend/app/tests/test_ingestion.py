@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+pytest.importorskip('chardet')
+
+from app.services import ingestion  # noqa: E402
+from app.services.ingestion import read_project_directory  # noqa: E402
+
+
+def test_read_project_directory_prunes_skipped_directories(tmp_path, monkeypatch):
+    for path, content in {
+        'app/main.py': 'print("hi")\n',
+        'app/__pycache__/main.cpython-311.pyc': 'x',
+        '.git/objects/ab/cdef': 'blob',
+        'node_modules/react/index.js': 'module.exports = {}\n',
+        'docs/index.md': '# Docs\n',
+        'src/dist/util.py': 'x = 1\n',
+        'yarn.lock': '',
+        '.docignore': 'docs/\n',
+    }.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+
+    walked = []
+    walk = os.walk
+
+    def recording_walk(top, *args, **kwargs):
+        for entry in walk(top, *args, **kwargs):
+            walked.append(os.path.relpath(entry[0], tmp_path))
+            yield entry
+
+    monkeypatch.setattr(ingestion.os, 'walk', recording_walk)
+    files_content, excluded_files = read_project_directory(tmp_path)
+
+    assert set(files_content) == {'app/main.py', 'src/dist/util.py', '.docignore'}
+    assert excluded_files == {
+        '.git/': 'vendored',
+        'app/__pycache__/': 'vendored',
+        'docs/': 'ignored',
+        'node_modules/': 'vendored',
+        'yarn.lock': 'generated',
+    }
+    assert not any(part in path for path in walked for part in ('.git', 'node_modules', '__pycache__', 'docs'))
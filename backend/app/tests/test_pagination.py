@@ -0,0 +1,79 @@
+import pytest
+
+from app.utils.pagination import (
+    MAX_PAGE_SIZE,
+    encode_cursor,
+    field_requested,
+    paginate_items,
+    paginate_keys,
+    parse_fields,
+    select_fields,
+)
+
+
+def test_paginate_keys_walks_every_page_despite_inserts():
+    keys = [f'project-{number:02d}' for number in range(5)]
+    page, cursor = paginate_keys(keys, None, 2)
+    assert page == ['project-00', 'project-01']
+
+    # A key added before the cursor does not shift the next page
+    keys.insert(0, 'a-new-project')
+    page, cursor = paginate_keys(keys, cursor, 2)
+    assert page == ['project-02', 'project-03']
+    page, cursor = paginate_keys(keys, cursor, 2)
+    assert page == ['project-04'] and cursor is None
+
+
+def test_paginate_items_by_offset():
+    items = list(range(7))
+    page, cursor = paginate_items(items, None, 3)
+    assert page == [0, 1, 2]
+    page, cursor = paginate_items(items, cursor, 3)
+    assert page == [3, 4, 5]
+    page, cursor = paginate_items(items, cursor, 3)
+    assert page == [6] and cursor is None
+    assert len(paginate_items(list(range(1000)), None, 10_000)[0]) == MAX_PAGE_SIZE
+
+
+@pytest.mark.parametrize('cursor', [
+    'not-a-cursor',
+    encode_cursor([1, 2]),
+    encode_cursor({'offset': -3}),
+    encode_cursor({'offset': '5'}),
+    encode_cursor({'offset': True}),
+])
+def test_paginate_items_rejects_crafted_cursors(cursor):
+    with pytest.raises(ValueError):
+        paginate_items(list(range(10)), cursor, 3)
+
+
+@pytest.mark.parametrize('after', [1, ['a'], {'b': 1}])
+def test_paginate_keys_rejects_non_string_cursor(after):
+    with pytest.raises(ValueError):
+        paginate_keys(['a', 'b'], encode_cursor({'after': after}), 1)
+
+
+def test_field_requested():
+    fields = parse_fields('project_info.technologies, analysis')
+    assert fields == ['project_info.technologies', 'analysis']
+    assert field_requested(fields, 'project_info')
+    assert field_requested(fields, 'analysis.summary')
+    assert not field_requested(fields, 'file_structure')
+    assert field_requested(parse_fields(''), 'anything')
+
+
+def test_select_fields_projects_dotted_paths():
+    data = {
+        'project_name': 'demo',
+        'project_info': {'technologies': ['Python'], 'description': 'Demo.'},
+        'analysis': {'summary': 'Short.', 'components': []},
+    }
+    assert select_fields(data, None) is data
+    assert select_fields(data, ['project_info.technologies', 'project_name', 'missing.path', 'analysis.nope']) == {
+        'project_info': {'technologies': ['Python']},
+        'project_name': 'demo',
+    }
+    # A broader field wins regardless of order and the source stays untouched
+    for fields in (['analysis', 'analysis.summary'], ['analysis.summary', 'analysis']):
+        assert select_fields(data, fields) == {'analysis': data['analysis']}
+    assert data['analysis'] == {'summary': 'Short.', 'components': []}
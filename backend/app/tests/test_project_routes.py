@@ -0,0 +1,52 @@
+import pytest
+
+pytest.importorskip('fastapi')
+pytest.importorskip('httpx')
+
+from fastapi import routing
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import project
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('jsonable_encoder ran on a response payload')
+
+    monkeypatch.setattr(routing, 'jsonable_encoder', fail)
+    monkeypatch.setattr(project, 'processed_projects', {
+        'demo': {
+            'version': 1,
+            'files_content': {'app/main.py': 'import app.util\n'},
+            'project_info': {
+                'description': 'Demo project',
+                'key_components': [{'file': 'app/main.py', 'classes': [], 'functions': [{'name': 'main'}]}],
+                'central_modules': [{'file': 'app/main.py', 'centrality': 1.0}],
+            },
+            'components': {'app/main.py': {'file': 'app/main.py', 'description': 'Entry point.'}},
+        }
+    })
+
+    async def build_documentation(project_name, project_data, sections):
+        return {'project_info': project_data['project_info'], 'analysis': {'summary': 'Demo'}}
+
+    monkeypatch.setattr(project, '_build_documentation', build_documentation)
+    return TestClient(app)
+
+
+def test_large_payload_routes_skip_jsonable_encoder(client):
+    response = client.get('/api/projects')
+    assert response.status_code == 200
+    assert response.json()['items'][0]['name'] == 'demo'
+
+    response = client.post('/api/generate-docs/demo')
+    assert response.status_code == 200
+    assert response.json()['documentation']['analysis'] == {'summary': 'Demo'}
+
+    response = client.get('/api/projects/demo/components')
+    assert response.json()['items'][0]['description'] == 'Entry point.'
+
+    response = client.get('/api/projects/demo/components/app/main.py')
+    assert response.json()['component']['description'] == 'Entry point.'
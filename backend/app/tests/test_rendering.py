@@ -0,0 +1,38 @@
+from app.services.rendering import render_component_markdown, render_markdown
+
+COMPONENT = {
+    'file': 'app/models.py',
+    'description': ' Data models. ',
+    'classes': [{'name': 'User', 'docstring': 'A user.', 'methods': ['save']}],
+    'functions': [{'name': 'load', 'docstring': 'Load users.', 'args': ['path', 'limit']}],
+}
+
+
+def test_render_component_lists_classes_methods_and_functions():
+    assert render_component_markdown(COMPONENT) == (
+        "## `app/models.py`\n"
+        "\n"
+        "Data models.\n"
+        "\n"
+        "- **class `User`**: A user.\n"
+        "  - `save()`\n"
+        "- **`load(path, limit)`**: Load users.\n"
+    )
+
+
+def test_render_markdown_skips_empty_sections():
+    documentation = {
+        'project_name': 'demo',
+        'project_info': {'description': 'A demo.', 'technologies': ['Python', 'Docker'], 'dependencies': []},
+        'analysis': {
+            'components': [COMPONENT],
+            'code_quality': {'total_lines': 10, 'code_lines': 8, 'comment_lines': 1, 'docstring_coverage': 50},
+        },
+    }
+
+    markdown = render_markdown(documentation)
+
+    assert markdown.startswith("# demo\n\nA demo.\n\n## Technologies\n\n- Docker\n- Python\n")
+    assert "## Dependencies" not in markdown and "## Summary" not in markdown
+    assert "# Components\n\n## `app/models.py`" in markdown
+    assert "- Docstring coverage: 50.0%" in markdown
@@ -0,0 +1,129 @@
+import math
+import random
+
+import pytest
+
+# The index reads the analyzers' docstring placeholder from the documentation service
+pytest.importorskip('dotenv')
+pytest.importorskip('google.generativeai')
+
+from app.utils import search_index  # noqa: E402
+from app.utils.search_index import build_search_index, component_documents, tokenize  # noqa: E402
+
+
+COMPONENTS = [
+    {
+        'file': 'app/services/documentation.py',
+        'description': 'Generates project documentation with Gemini.',
+        'classes': [],
+        'functions': [
+            {'name': 'process_project', 'docstring': 'Process project files.', 'args': ['files_content']},
+            {'name': 'extract_classes', 'docstring': 'No documentation available', 'args': ['content']},
+        ],
+    },
+    {
+        'file': 'app/routers/project.py',
+        'classes': [{'name': 'ProjectStore', 'docstring': 'Keeps uploaded projects.', 'methods': ['add']}],
+        'functions': [],
+    },
+]
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize('processProject') == ['processproject', 'process', 'project']
+    assert tokenize('extract_classes(x)') == ['extract_classes', 'extract', 'classes', 'x']
+
+
+def test_search_ranks_symbol_names_first():
+    index = build_search_index(COMPONENTS)
+    results = index.search('process project')
+    assert results[0]['name'] == 'process_project'
+    assert index.search('ProjectStore')[0]['kind'] == 'class'
+    assert index.search('available') == []
+
+
+def test_update_file_replaces_documents():
+    index = build_search_index(COMPONENTS)
+    size = len(index)
+    index.update_file('app/routers/project.py', component_documents({
+        'file': 'app/routers/project.py',
+        'description': 'HTTP routes for uploads.',
+        'classes': [],
+        'functions': [{'name': 'upload_project', 'docstring': '', 'args': ['file']}],
+    }))
+    assert len(index) == size
+    assert index.search('store') == []
+    assert index.search('upload')[0]['name'] == 'upload_project'
+
+    index.remove_file('app/routers/project.py')
+    assert index.search('upload') == []
+
+
+def test_replace_files_drops_files_without_components():
+    index = build_search_index(COMPONENTS)
+
+    # A sync emptied documentation.py and left project.py unchanged
+    index.replace_files(['app/services/documentation.py'], [])
+
+    assert [result['file'] for result in index.search('process_project')] == ['app/routers/project.py'] * 2
+    assert index.search('ProjectStore')[0]['name'] == 'ProjectStore'
+
+
+def _brute_force_scores(index, query):
+    """Score every document for a query with plain BM25."""
+    scores = {}
+    for term in set(tokenize(query)):
+        containing = [doc_id for doc_id, terms in enumerate(index.doc_terms) if terms and term in terms]
+        idf = math.log(1 + (len(index) - len(containing) + 0.5) / (len(containing) + 0.5))
+        for doc_id in containing:
+            frequency = index.doc_terms[doc_id][term]
+            norm = search_index.BM25_K1 * (
+                1 - search_index.BM25_B + search_index.BM25_B * index.doc_lengths[doc_id] / index.average_length
+            )
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (search_index.BM25_K1 + 1) / (frequency + norm)
+    return scores
+
+
+def test_pruned_search_matches_brute_force(monkeypatch):
+    # Small thresholds so ordered postings, pruned rounds and the full merge all run
+    monkeypatch.setattr(search_index, 'ORDERED_MIN_POSTINGS', 8)
+    monkeypatch.setattr(search_index, 'SEARCH_MIN_BLOCK', 2)
+    rng = random.Random(0)
+    words = ['handle', 'value', 'parse', 'request', 'cache', 'store', 'load', 'event', 'user', 'token']
+
+    def component(number):
+        return {
+            'file': f'src/module_{number}.py',
+            'description': ' '.join(rng.choices(words, weights=range(10, 0, -1), k=rng.randint(1, 8))),
+            'classes': [],
+            'functions': [
+                {'name': '_'.join(rng.sample(words, 2)), 'docstring': ' '.join(rng.choices(words, k=3)), 'args': ['value']}
+                for _ in range(rng.randint(1, 4))
+            ],
+        }
+
+    index = build_search_index([component(number) for number in range(300)])
+    for round_number in range(3):
+        for query in ('handle', 'handle value', 'parse request cache', 'token user value store'):
+            for limit in (1, 5, 20):
+                results = index.search(query, limit)
+                scores = _brute_force_scores(index, query)
+                expected = sorted(scores.values(), reverse=True)[:limit]
+                assert [result['score'] for result in results] == [round(score, 4) for score in expected]
+                for result in results:
+                    document = {key: value for key, value in result.items() if key != 'score'}
+                    assert round(scores[index.documents.index(document)], 4) == result['score']
+        # Later rounds search an index that was updated in place
+        for number in rng.sample(range(300), 40):
+            index.update_file(f'src/module_{number}.py', component_documents(component(number)))
+        for number in rng.sample(range(300), 10):
+            index.remove_file(f'src/module_{number}.py')
+
+
+def test_tokenize_keeps_digits_with_words():
+    assert tokenize('pkg7/utf8Decoder') == ['pkg7', 'utf8decoder', 'utf8', 'decoder']
+
+
+def test_path_terms_only_match_file_documents():
+    index = build_search_index(COMPONENTS)
+    assert {result['kind'] for result in index.search('services')} == {'file'}
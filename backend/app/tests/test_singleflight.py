@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight("test")
+    runs = []
+
+    async def compute(value):
+        runs.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.run('key', compute, 21) for _ in range(5)))
+        other = await flight.run('other', compute, 1)
+        again = await flight.run('key', compute, 21)
+        return results, other, again
+
+    results, other, again = asyncio.run(scenario())
+    assert results == [42] * 5
+    assert (other, again) == (2, 42)
+    assert runs == [21, 1, 21]
+    assert flight.get_stats() == {"calls": 3, "coalesced": 4, "in_flight": 0}
+
+
+def test_errors_and_cancellation():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def scenario():
+        results = await asyncio.gather(flight.run('fail', fail), flight.run('fail', fail), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+
+        # The first caller going away does not cancel the work for the second one
+        first = asyncio.ensure_future(flight.run('slow', slow))
+        second = asyncio.ensure_future(flight.run('slow', slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
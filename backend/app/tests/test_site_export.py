@@ -0,0 +1,112 @@
+import json
+import zipfile
+
+import pytest
+
+# Search entries read the analyzers' docstring placeholder from the documentation service
+pytest.importorskip('dotenv')
+pytest.importorskip('google.generativeai')
+
+from app.services import site_export  # noqa: E402
+from app.services.site_export import export_site, page_slug, site_path, zip_site  # noqa: E402
+
+
+def documentation(components):
+    return {
+        'project_name': 'demo',
+        'project_info': {'description': 'A demo project.', 'technologies': ['Python'], 'entry_points': ['main.py']},
+        'analysis': {'summary': 'Total Files: 2', 'components': components},
+    }
+
+
+COMPONENTS = [
+    {
+        'file': 'app/main.py',
+        'description': 'Starts the <app>.',
+        'classes': [],
+        'functions': [{'name': 'run_server', 'docstring': 'Run it.', 'args': ['port']}],
+    },
+    {
+        'file': 'app/models.py',
+        'description': 'Data models.',
+        'classes': [{'name': 'User', 'docstring': 'A user.', 'methods': ['save']}],
+        'functions': [],
+    },
+]
+
+
+def test_export_writes_pages_and_search_index(tmp_path):
+    stats = export_site(documentation(COMPONENTS), tmp_path, workers=2)
+
+    assert stats == {'pages': 4, 'rendered': 4, 'unchanged': 0, 'removed_files': 0}
+    main_page = tmp_path / 'components' / f"{page_slug('app/main.py')}.html"
+    assert 'Starts the &lt;app&gt;.' in main_page.read_text()
+    assert f"components/{page_slug('app/models.py')}.md" in (tmp_path / 'index.md').read_text()
+
+    index = json.loads((tmp_path / 'search-index.json').read_text())
+    user = index['documents'][index['terms']['user'][0][0]]
+    assert user == {'kind': 'class', 'name': 'User', 'file': 'app/models.py', 'page': f"components/{page_slug('app/models.py')}.html"}
+
+
+def test_export_only_rerenders_changed_pages(tmp_path):
+    export_site(documentation(COMPONENTS), tmp_path)
+    models_page = tmp_path / 'components' / f"{page_slug('app/models.py')}.md"
+
+    changed = [{**COMPONENTS[0], 'description': 'Starts the server.'}]
+    stats = export_site(documentation(changed), tmp_path)
+
+    # main.py, the index and the search index change, models.py is removed
+    assert stats == {'pages': 3, 'rendered': 3, 'unchanged': 0, 'removed_files': 2}
+    assert not models_page.exists()
+
+    stats = export_site(documentation(changed), tmp_path)
+    assert stats['rendered'] == 0 and stats['unchanged'] == 3
+
+    export_site(documentation(changed + [COMPONENTS[1]]), tmp_path)
+    main_page = tmp_path / 'components' / f"{page_slug('app/main.py')}.md"
+    mtime = main_page.stat().st_mtime_ns
+    stats = export_site(documentation(changed + [{**COMPONENTS[1], 'description': 'Models.'}]), tmp_path)
+    assert stats['rendered'] == 3
+    assert main_page.stat().st_mtime_ns == mtime
+
+
+def test_zip_site_excludes_manifest(tmp_path):
+    site = tmp_path / 'demo'
+    export_site(documentation(COMPONENTS), site)
+
+    with zipfile.ZipFile(zip_site(site)) as archive:
+        names = set(archive.namelist())
+    assert 'index.html' in names and f"components/{page_slug('app/main.py')}.html" in names
+    assert '.manifest.json' not in names
+
+
+def test_page_slugs_are_unique_per_path():
+    paths = ['a/b.py', 'a__b.py', 'a b.py', 'a_b.py']
+    slugs = [page_slug(path) for path in paths]
+
+    assert slugs[0].startswith('a__b.py-')
+    assert len(set(slugs)) == len(paths)
+
+
+def test_site_path_stays_inside_site_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(site_export, 'SITE_DIR', tmp_path / 'sites')
+
+    assert site_path('demo') == (tmp_path / 'sites' / 'demo').resolve()
+    assert site_path('v1.2', '.zip').name == 'v1.2.zip'
+    for name in ('..', '', '../other', 'a/b'):
+        with pytest.raises(ValueError):
+            site_path(name)
+
+
+def test_rerendered_page_removes_files_it_no_longer_writes(tmp_path):
+    export_site(documentation(COMPONENTS), tmp_path)
+    manifest = json.loads((tmp_path / '.manifest.json').read_text())
+    old_page = tmp_path / 'components' / 'app__main.py.md'
+    old_page.write_text('old slug')
+    manifest['component:app/main.py'] = {'hash': 'old', 'files': ['components/app__main.py.md']}
+    (tmp_path / '.manifest.json').write_text(json.dumps(manifest))
+
+    stats = export_site(documentation(COMPONENTS), tmp_path)
+
+    assert stats['rendered'] == 1 and stats['removed_files'] == 1
+    assert not old_page.exists()
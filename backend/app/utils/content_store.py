@@ -0,0 +1,335 @@
+import atexit
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Number of recently used projects kept in the in-memory arena
+HOT_PROJECTS = int(os.getenv('DOCGEN_HOT_PROJECTS', 8))
+
+# Compact the arena once this share of it belongs to released blobs
+COMPACT_GARBAGE_RATIO = 0.5
+COMPACT_MIN_BYTES = 1024 * 1024
+
+
+# Stores still open at interpreter exit, closed so no spill file outlives the process
+_open_stores: 'weakref.WeakSet[ContentStore]' = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_stores():
+    for store in list(_open_stores):
+        store.close()
+
+
+def _encode(content: str) -> bytes:
+    return content.encode('utf-8', 'surrogatepass')
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode('utf-8', 'surrogatepass')
+
+
+def _digest(raw: bytes) -> bytes:
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+class SpillFile:
+    """Read-only memory-mapped file holding the blobs of a cold project."""
+
+    def __init__(self, path: str, blobs: Dict[bytes, bytes]):
+        self.path = path
+        self.index: Dict[bytes, Tuple[int, int]] = {}
+        offset = 0
+        with open(path, 'wb') as file:
+            for digest, raw in blobs.items():
+                file.write(raw)
+                self.index[digest] = (offset, len(raw))
+                offset += len(raw)
+
+        self._file = open(path, 'rb')
+        # mmap cannot map an empty file
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if offset else None
+
+    def read(self, digest: bytes) -> bytes:
+        offset, length = self.index[digest]
+        return self._map[offset:offset + length] if length else b''
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class ContentStore:
+    """Deduplicated UTF-8 storage for the file contents of every project.
+
+    Contents are kept as UTF-8 bytes in one shared arena instead of one
+    Python str per file, identical files are stored once (reference
+    counted by hash) and cold projects can be moved to memory-mapped spill
+    files so they no longer occupy the arena.
+
+    A project that is replaced or removed while requests still read it
+    stays readable until the last of them unpins it. All arena access
+    goes through one lock so spill_cold can run in a worker thread.
+
+    Without a configured spill_dir, spill files go to a temporary
+    directory created by this process on the first spill, which close()
+    removes. Stores still open at interpreter exit are closed then.
+    """
+
+    def __init__(self, spill_dir: Optional[str] = None):
+        self.arena = bytearray()
+        self.blobs: Dict[bytes, Tuple[int, int]] = {}
+        self.refcounts: Dict[bytes, int] = {}
+        self.garbage = 0
+        self.projects: Dict[str, 'ProjectFiles'] = {}
+        self.spill_dir = spill_dir or os.getenv('DOCGEN_SPILL_DIR')
+        self.owns_spill_dir = False
+        self.lock = threading.RLock()
+        _open_stores.add(self)
+
+    def spill_directory(self) -> str:
+        """Directory for new spill files, creating this process's own one if none is configured."""
+        with self.lock:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix=f"docgen-spill-{os.getpid()}-")
+                self.owns_spill_dir = True
+            return self.spill_dir
+
+    def put(self, digest: bytes, raw: bytes):
+        """Add a reference to a blob, storing it if it is new."""
+        with self.lock:
+            if digest in self.refcounts:
+                self.refcounts[digest] += 1
+                return
+            self.blobs[digest] = (len(self.arena), len(raw))
+            self.arena += raw
+            self.refcounts[digest] = 1
+
+    def release(self, digest: bytes):
+        """Drop a reference to a blob, freeing it with the last reference."""
+        with self.lock:
+            self.refcounts[digest] -= 1
+            if self.refcounts[digest]:
+                return
+            del self.refcounts[digest]
+            _, length = self.blobs.pop(digest)
+            self.garbage += length
+            if self.garbage > COMPACT_MIN_BYTES and self.garbage > len(self.arena) * COMPACT_GARBAGE_RATIO:
+                self.compact()
+
+    def read(self, digest: bytes) -> bytes:
+        with self.lock:
+            offset, length = self.blobs[digest]
+            return bytes(self.arena[offset:offset + length])
+
+    def compact(self):
+        """Rewrite the arena without the space of released blobs."""
+        with self.lock:
+            arena = bytearray()
+            for digest, (offset, length) in self.blobs.items():
+                self.blobs[digest] = (len(arena), length)
+                arena += self.arena[offset:offset + length]
+            logger.info(f"Compacted content arena from {len(self.arena)} to {len(arena)} bytes")
+            self.arena = arena
+            self.garbage = 0
+
+    def add_project(self, name: str, files_content: Dict[str, str]) -> 'ProjectFiles':
+        """Store a project's files, replacing any earlier project of that name."""
+        project = ProjectFiles(self, name)
+        project.update(files_content)
+        self.remove_project(name)
+        self.projects[name] = project
+        return project
+
+    def remove_project(self, name: str):
+        """Forget a project; its blobs are released once no request reads it."""
+        project = self.projects.pop(name, None)
+        if project is not None:
+            project.retire()
+
+    def spill_cold(self, keep_hot: int = HOT_PROJECTS):
+        """Move all but the keep_hot most recently used projects to spill files.
+
+        Safe to call from a worker thread while requests read the projects.
+        """
+        by_recency = sorted(list(self.projects.values()), key=lambda project: project.last_access, reverse=True)
+        for project in by_recency[keep_hot:]:
+            with project.in_use():
+                if not project.closed and project.arena_refs():
+                    project.spill()
+
+    def close(self):
+        """Close every project, deleting their spill files and the directory this store created."""
+        with self.lock:
+            for name in list(self.projects):
+                self.projects.pop(name).close()
+            if self.owns_spill_dir:
+                shutil.rmtree(self.spill_dir, ignore_errors=True)
+                self.spill_dir = None
+                self.owns_spill_dir = False
+        _open_stores.discard(self)
+
+    def __enter__(self) -> 'ContentStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "projects": len(self.projects),
+            "spilled_projects": sum(1 for project in self.projects.values() if project.spill_file),
+            "blobs": len(self.blobs),
+            "arena_bytes": len(self.arena),
+            "garbage_bytes": self.garbage
+        }
+
+
+class ProjectFiles(MutableMapping):
+    """Dict-like view of one project's files backed by a ContentStore.
+
+    Keys are file paths and values are decoded lazily, one file at a time,
+    when they are read, so the analyzers can keep treating it as a
+    Dict[str, str]. Requests that read it across awaits hold it with
+    in_use() so a replaced project is not closed under them.
+    """
+
+    def __init__(self, store: ContentStore, name: str):
+        self.store = store
+        self.name = name
+        self.paths: Dict[str, bytes] = {}
+        self.spill_file: Optional[SpillFile] = None
+        self.last_access = time.monotonic()
+        self.users = 0
+        self.retired = False
+        self.closed = False
+
+    def _in_spill(self, digest: bytes) -> bool:
+        return self.spill_file is not None and digest in self.spill_file.index
+
+    def __getitem__(self, path: str) -> str:
+        self.last_access = time.monotonic()
+        with self.store.lock:
+            digest = self.paths[path]
+            raw = self.spill_file.read(digest) if self._in_spill(digest) else self.store.read(digest)
+        return _decode(raw)
+
+    def __setitem__(self, path: str, content: str):
+        raw = _encode(content)
+        digest = _digest(raw)
+        with self.store.lock:
+            if path in self.paths:
+                del self[path]
+            # Blobs already in this project's spill file are not added to the arena again
+            if not self._in_spill(digest):
+                self.store.put(digest, raw)
+            self.paths[path] = digest
+        self.last_access = time.monotonic()
+
+    def __delitem__(self, path: str):
+        with self.store.lock:
+            digest = self.paths.pop(path)
+            if not self._in_spill(digest):
+                self.store.release(digest)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self.paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def digest(self, path: str) -> str:
+        """Content hash of a file, equal for equal contents, without reading it."""
+        return self.paths[path].hex()
+
+    def arena_refs(self) -> int:
+        """Number of files whose content lives in the shared arena."""
+        with self.store.lock:
+            return sum(1 for digest in self.paths.values() if not self._in_spill(digest))
+
+    def spill(self):
+        """Write every blob of this project to a memory-mapped spill file.
+
+        The file is written without holding the store lock, files changed in
+        the meantime keep their arena references.
+        """
+        with self.store.lock:
+            digests = set(self.paths.values())
+        blobs = {}
+        for digest in digests:
+            with self.store.lock:
+                if digest in self.store.blobs or self._in_spill(digest):
+                    blobs[digest] = self.spill_file.read(digest) if self._in_spill(digest) else self.store.read(digest)
+
+        handle, path = tempfile.mkstemp(prefix=f"docgen-{self.name}-", suffix='.spill', dir=self.store.spill_directory())
+        os.close(handle)
+        spill_file = SpillFile(path, blobs)
+
+        with self.store.lock:
+            # Hand the arena references over to the spill file, and blobs that
+            # only the old spill file holds back to the arena
+            for digest in self.paths.values():
+                if digest in spill_file.index:
+                    if not self._in_spill(digest):
+                        self.store.release(digest)
+                elif self._in_spill(digest):
+                    self.store.put(digest, self.spill_file.read(digest))
+            if self.spill_file is not None:
+                self.spill_file.close()
+            self.spill_file = spill_file
+        logger.info(f"Spilled {len(blobs)} blobs of project {self.name} to {path}")
+
+    def pin(self):
+        with self.store.lock:
+            self.users += 1
+
+    def unpin(self):
+        with self.store.lock:
+            self.users -= 1
+            if self.retired and not self.users:
+                self.close()
+
+    @contextmanager
+    def in_use(self) -> Iterator['ProjectFiles']:
+        """Keep this project readable for the duration of the block."""
+        self.pin()
+        try:
+            yield self
+        finally:
+            self.unpin()
+
+    def retire(self):
+        """Mark the project as replaced and close it once it is no longer in use."""
+        with self.store.lock:
+            self.retired = True
+            if not self.users:
+                self.close()
+
+    def close(self):
+        """Release every blob held by this project."""
+        with self.store.lock:
+            for path in list(self.paths):
+                del self[path]
+            if self.spill_file is not None:
+                self.spill_file.close()
+                self.spill_file = None
+            self.closed = True
@@ -0,0 +1,242 @@
+import fnmatch
+import logging
+import os
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this are only sampled before analysis
+MAX_FILE_BYTES = int(os.getenv('DOCGEN_MAX_FILE_BYTES', 200_000))
+MAX_FILE_LINES = int(os.getenv('DOCGEN_MAX_FILE_LINES', 5_000))
+
+# Number of lines kept from the head and the tail of a sampled file
+SAMPLE_HEAD_LINES = 200
+SAMPLE_TAIL_LINES = 50
+
+IGNORE_FILENAMES = ('.gitignore', '.docignore')
+
+GENERATED_FILENAMES = {
+    'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'poetry.lock',
+    'pipfile.lock', 'cargo.lock', 'composer.lock', 'gemfile.lock', 'go.sum',
+}
+GENERATED_SUFFIXES = ('_pb2.py', '_pb2_grpc.py', '.pb.go', '.designer.cs', '.g.dart', '.map')
+# Markers of generated files, looked for only in the comment lines at the top of a file
+GENERATED_MARKERS = (
+    '@generated', 'code generated by', 'automatically generated by', 'auto-generated by', 'autogenerated by'
+)
+# Phrases that mark a generated file only together, 'do not edit' alone is common in hand written files
+GENERATED_MARKER_PAIRS = (('do not edit', 'generated'),)
+COMMENT_PREFIXES = ('#', '//', '/*', '<!--', '--')
+HEADER_SCAN_BYTES = 2048
+
+VENDORED_DIRS = {
+    'node_modules', 'vendor', 'vendors', 'third_party', 'third-party', 'site-packages',
+    'bower_components', '.venv', 'venv', '__pycache__', '.git',
+}
+# Build output directories, vendored only at the project root since src/dist/ can hold real sources
+ROOT_VENDORED_DIRS = {'dist', 'build'}
+
+MINIFIABLE_EXTENSIONS = ('.js', '.mjs', '.cjs', '.css')
+MINIFIED_AVG_LINE_LENGTH = 300
+
+
+def parse_ignore_file(content: str, base_dir: str = '') -> List[Tuple[str, str]]:
+    """Parse a .gitignore style file into (base_dir, pattern) rules."""
+    rules = []
+    for line in content.splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            rules.append((base_dir, line))
+    return rules
+
+
+def load_ignore_rules(ignore_files: Dict[str, str]) -> List[Tuple[str, str]]:
+    """Build ignore rules from ignore files keyed by their relative path."""
+    rules = []
+    for path, content in ignore_files.items():
+        base_dir = os.path.dirname(path.replace('\\', '/'))
+        rules.extend(parse_ignore_file(content, base_dir))
+    return rules
+
+
+def _match_pattern(path: str, pattern: str) -> bool:
+    """Match a path relative to the ignore file against a single pattern."""
+    directory_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    parts = path.split('/')
+
+    if pattern.startswith('/') or '/' in pattern:
+        # Anchored pattern: match against the path and its parent directories
+        pattern = pattern.lstrip('/')
+        candidates = ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+        if directory_only:
+            candidates = candidates[:-1]
+        return any(fnmatch.fnmatch(candidate, pattern) for candidate in candidates)
+
+    # Unanchored pattern: match against any path component
+    components = parts[:-1] if directory_only else parts
+    return any(fnmatch.fnmatch(component, pattern) for component in components)
+
+
+def is_ignored(path: str, rules: List[Tuple[str, str]]) -> bool:
+    """Check whether a relative path is excluded by the ignore rules."""
+    path = path.replace('\\', '/')
+    ignored = False
+    for base_dir, pattern in rules:
+        if base_dir:
+            if not path.startswith(base_dir + '/'):
+                continue
+            relative = path[len(base_dir) + 1:]
+        else:
+            relative = path
+
+        negate = pattern.startswith('!')
+        if _match_pattern(relative, pattern[1:] if negate else pattern):
+            ignored = not negate
+    return ignored
+
+
+def _is_vendored_dir(parts: List[str]) -> bool:
+    return any(part in VENDORED_DIRS for part in parts) or bool(parts and parts[0] in ROOT_VENDORED_DIRS)
+
+
+def classify_directory(path: str) -> Optional[str]:
+    """Classify a directory from its relative path, so a walk can skip it whole."""
+    parts = path.replace('\\', '/').strip('/').lower().split('/')
+    return 'vendored' if _is_vendored_dir(parts) else None
+
+
+def classify_path(path: str) -> Optional[str]:
+    """Classify a file from its path alone, without reading it."""
+    parts = path.replace('\\', '/').lower().split('/')
+    filename = parts[-1]
+
+    if _is_vendored_dir(parts[:-1]):
+        return 'vendored'
+
+    if filename in GENERATED_FILENAMES or filename.endswith(GENERATED_SUFFIXES):
+        return 'generated'
+
+    if '.min.' in filename:
+        return 'minified'
+
+    return None
+
+
+def _leading_comments(content: str) -> str:
+    """Lowercased comment lines at the top of a file, up to its first line of code.
+
+    Docstrings and string literals are code, so text in them never marks a
+    file as generated.
+    """
+    comments = []
+    block_end = None
+    for line in content[:HEADER_SCAN_BYTES].splitlines():
+        stripped = line.strip()
+        if block_end:
+            comments.append(stripped)
+            if block_end in stripped:
+                block_end = None
+            continue
+        if not stripped:
+            continue
+        if not stripped.startswith(COMMENT_PREFIXES):
+            break
+        comments.append(stripped)
+        for start, end in (('/*', '*/'), ('<!--', '-->')):
+            if stripped.startswith(start) and end not in stripped[len(start):]:
+                block_end = end
+    return '\n'.join(comments).lower()
+
+
+def is_generated_header(content: str) -> bool:
+    """Check the leading comments of a file for a generated code marker."""
+    header = _leading_comments(content)
+    return (
+        any(marker in header for marker in GENERATED_MARKERS)
+        or any(all(phrase in header for phrase in pair) for pair in GENERATED_MARKER_PAIRS)
+    )
+
+
+def classify_file(path: str, content: str) -> Optional[str]:
+    """Classify a file as generated, minified, vendored or oversized.
+
+    Returns None for regular source files that should be fully analyzed.
+    """
+    reason = classify_path(path)
+    if reason:
+        return reason
+
+    filename = path.replace('\\', '/').lower().split('/')[-1]
+    if is_generated_header(content):
+        return 'generated'
+
+    line_count = content.count('\n') + 1
+    if filename.endswith(MINIFIABLE_EXTENSIONS) and len(content) / line_count > MINIFIED_AVG_LINE_LENGTH:
+        return 'minified'
+
+    if len(content) > MAX_FILE_BYTES or line_count > MAX_FILE_LINES:
+        return 'oversized'
+
+    return None
+
+
+def sample_content(content: str) -> str:
+    """Keep the head and tail of a large file so it can still be summarized."""
+    lines = content.splitlines()
+    if len(lines) <= SAMPLE_HEAD_LINES + SAMPLE_TAIL_LINES:
+        # Few but very long lines: fall back to a character based sample
+        if len(content) <= MAX_FILE_BYTES:
+            return content
+        return content[:MAX_FILE_BYTES]
+
+    omitted = len(lines) - SAMPLE_HEAD_LINES - SAMPLE_TAIL_LINES
+    return "\n".join(
+        lines[:SAMPLE_HEAD_LINES]
+        + [f"# ... {omitted} lines omitted ..."]
+        + lines[-SAMPLE_TAIL_LINES:]
+    )
+
+
+def filter_project_files(files_content: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Split project files into analyzable content and excluded files.
+
+    Generated, minified and vendored files are dropped from the analysis.
+    Oversized files keep their full content for the AST and metrics stages
+    and are only sampled (see sample_content) where they go into an LLM
+    prompt. The second value maps every excluded or oversized file to its
+    classification.
+    """
+    analyzable = {}
+    excluded = {}
+
+    for path, content in files_content.items():
+        reason = classify_file(path, content)
+        if reason is None or reason == 'oversized':
+            analyzable[path] = content
+        if reason is not None:
+            excluded[path] = reason
+
+    if excluded:
+        logger.info(f"Excluded or sampled {len(excluded)} of {len(files_content)} files")
+    return analyzable, excluded
+
+
+def summarize_exclusions(excluded_files: Dict[str, str]) -> Dict[str, Any]:
+    """Roll excluded paths up into counts per reason and per top-level directory.
+
+    Paths ending in '/' are directories that were skipped without being
+    walked, each counts once. Files at the project root are under '.'.
+    """
+    counts = Counter()
+    directories = defaultdict(Counter)
+    for path, reason in excluded_files.items():
+        counts[reason] += 1
+        parts = path.rstrip('/').split('/')
+        top = parts[0] if len(parts) > 1 or path.endswith('/') else '.'
+        directories[top][reason] += 1
+    return {
+        "counts": dict(sorted(counts.items())),
+        "directories": {directory: dict(sorted(reasons.items())) for directory, reasons in sorted(directories.items())}
+    }
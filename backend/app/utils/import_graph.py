@@ -0,0 +1,271 @@
+import ast
+import logging
+import posixpath
+import re
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+JS_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+
+# import x from './x', export { y } from './y', import './z', require('./w'), import('./v')
+JS_IMPORT_PATTERN = re.compile(
+    r"""(?:import|export)\s+(?:[^'";]*?\s+from\s+)?['"]([^'"]+)['"]"""
+    r"""|(?:require|import)\s*\(\s*['"]([^'"]+)['"]\s*\)"""
+)
+
+MAIN_GUARD_PATTERN = re.compile(r"""if\s+__name__\s*==\s*['"]__main__['"]""")
+JS_ENTRY_PATTERN = re.compile(r"""\.listen\s*\(|createRoot\s*\(|ReactDOM\.render\s*\(""")
+TEST_FILE_PATTERN = re.compile(r"""(^|/)(tests?/|test_[^/]*$|[^/]*_test\.py$|[^/]*\.(test|spec)\.[jt]sx?$)""")
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_ITERATIONS = 50
+PAGERANK_TOLERANCE = 1e-8
+
+
+# Files marking a directory that Python imports are resolved from
+PROJECT_ROOT_MARKERS = ('setup.py', 'setup.cfg', 'pyproject.toml', 'requirements.txt', 'manage.py')
+
+
+def _source_roots(filenames: List[str]) -> Set[str]:
+    """Find the directories absolute Python imports are resolved from.
+
+    These are the project root, directories holding packaging or
+    requirements files and the parent of every top-level package (the
+    outermost directory of a chain of __init__.py files). Only names that
+    start at one of these roots can be project imports, so 'import logging'
+    does not resolve to 'app/utils/logging.py'.
+    """
+    packages = {posixpath.dirname(name) for name in filenames if posixpath.basename(name) == '__init__.py'}
+    roots = {''}
+    for filename in filenames:
+        directory = posixpath.dirname(filename)
+        if posixpath.basename(filename) in PROJECT_ROOT_MARKERS:
+            roots.add(directory)
+        if directory and directory in packages:
+            while posixpath.dirname(directory) in packages and directory:
+                directory = posixpath.dirname(directory)
+            roots.add(posixpath.dirname(directory))
+    return roots
+
+
+def _python_module_names(filename: str, roots: Set[str]) -> List[str]:
+    """Return every dotted name a Python file can be imported as.
+
+    'backend/app/main.py' can be imported as 'backend.app.main' from the
+    project root and as 'app.main' when 'backend' is a source root.
+    """
+    parts = filename[:-3].split('/')
+    if parts[-1] == '__init__':
+        parts = parts[:-1]
+    names = []
+    for root in roots:
+        depth = len(root.split('/')) if root else 0
+        if (not root or filename.startswith(root + '/')) and parts[depth:]:
+            names.append('.'.join(parts[depth:]))
+    return names
+
+
+def _build_module_index(filenames: List[str]) -> Dict[str, str]:
+    """Map dotted module names to files, preferring the shallowest path on clashes."""
+    roots = _source_roots(filenames)
+    index = {}
+    depth = {}
+    for filename in filenames:
+        if not filename.endswith('.py'):
+            continue
+        for name in _python_module_names(filename, roots):
+            # Several source roots can provide the same name, keep the
+            # file closest to the project root
+            if name not in index or filename.count('/') < depth[name]:
+                index[name] = filename
+                depth[name] = filename.count('/')
+    return index
+
+
+def _resolve_relative_module(filename: str, level: int, module: Optional[str]) -> str:
+    """Turn a relative import into a dotted name relative to the file's path."""
+    package = filename.split('/')[:-1]
+    if level > 1:
+        package = package[:len(package) - (level - 1)]
+    name = '.'.join(package)
+    if module:
+        name = f"{name}.{module}" if name else module
+    return name
+
+
+def _python_import_names(filename: str, content: str) -> List[str]:
+    """List the dotted module names a Python file may import."""
+    names = []
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return names
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = _resolve_relative_module(filename, node.level, node.module)
+            else:
+                base = node.module or ''
+            # 'from pkg import mod' may import a submodule rather than a name,
+            # resolution falls back to 'pkg' itself when 'pkg.mod' is no module
+            names.extend(f"{base}.{alias.name}" if base else alias.name for alias in node.names)
+    return names
+
+
+def _js_import_names(filename: str, content: str) -> List[str]:
+    """List the project-relative paths a JavaScript/TypeScript file imports."""
+    names = []
+    directory = posixpath.dirname(filename)
+
+    for match in JS_IMPORT_PATTERN.finditer(content):
+        specifier = match.group(1) or match.group(2)
+        # Bare specifiers ('react', 'lodash/fp') point at packages, not project files
+        if specifier.startswith('.'):
+            names.append(posixpath.normpath(posixpath.join(directory, specifier)))
+    return names
+
+
+def extract_import_names(filename: str, content: str) -> Optional[List[str]]:
+    """Parse the unresolved imports of a source file, None for non-source files.
+
+    The result only depends on the file itself, so callers can cache it and
+    re-parse changed files only.
+    """
+    normalized = filename.replace('\\', '/')
+    if normalized.endswith('.py'):
+        return _python_import_names(normalized, content)
+    if normalized.endswith(JS_EXTENSIONS):
+        return _js_import_names(normalized, content)
+    return None
+
+
+def _resolve_python_imports(filename: str, names: List[str], module_index: Dict[str, str]) -> Set[str]:
+    """Resolve dotted module names to project files.
+
+    Only the most specific module is an edge: importing 'pkg.mod' does not
+    also count as importing 'pkg/__init__.py'.
+    """
+    imports = set()
+    for name in names:
+        # Fall back to parent packages when the full name is not a module
+        while name:
+            target = module_index.get(name)
+            if target:
+                if target != filename:
+                    imports.add(target)
+                break
+            name = name.rpartition('.')[0]
+    return imports
+
+
+def _resolve_js_imports(filename: str, names: List[str], filenames: Set[str]) -> Set[str]:
+    """Resolve import paths to project files, trying extensions and index files."""
+    imports = set()
+    for base in names:
+        candidates = [base] + [base + ext for ext in JS_EXTENSIONS] + [f"{base}/index{ext}" for ext in JS_EXTENSIONS]
+        for candidate in candidates:
+            if candidate in filenames and candidate != filename:
+                imports.add(candidate)
+                break
+    return imports
+
+
+def build_import_graph(files_content: Dict[str, str], import_names: Optional[Dict[str, Optional[List[str]]]] = None) -> Dict[str, Set[str]]:
+    """Build an adjacency map from each source file to the project files it imports.
+
+    import_names is an optional cache of extract_import_names results keyed
+    by filename; missing entries are parsed and added to it.
+    """
+    if import_names is None:
+        import_names = {}
+    filenames = {name.replace('\\', '/'): name for name in files_content.keys()}
+    module_index = _build_module_index(list(filenames))
+    normalized_names = set(filenames)
+    graph = {}
+
+    for normalized, filename in filenames.items():
+        if filename not in import_names:
+            import_names[filename] = extract_import_names(filename, files_content[filename])
+        names = import_names[filename]
+        if names is None:
+            continue
+        if normalized.endswith('.py'):
+            targets = _resolve_python_imports(normalized, names, module_index)
+        else:
+            targets = _resolve_js_imports(normalized, names, normalized_names)
+        graph[filename] = {filenames[target] for target in targets}
+
+    # Imports of stylesheets, JSON and other assets are not module edges
+    for filename, targets in graph.items():
+        targets.intersection_update(graph.keys())
+
+    logger.info(f"Built import graph with {len(graph)} modules and {sum(len(t) for t in graph.values())} edges")
+    return graph
+
+
+def compute_centrality(graph: Dict[str, Set[str]]) -> Dict[str, float]:
+    """Rank modules with PageRank, where importing a module votes for it."""
+    nodes = list(graph)
+    if not nodes:
+        return {}
+
+    count = len(nodes)
+    rank = {node: 1.0 / count for node in nodes}
+    for _ in range(PAGERANK_ITERATIONS):
+        # Modules that import nothing spread their rank evenly
+        dangling = sum(rank[node] for node in nodes if not graph[node])
+        base = (1.0 - PAGERANK_DAMPING) / count + PAGERANK_DAMPING * dangling / count
+        updated = {node: base for node in nodes}
+        for node in nodes:
+            targets = graph[node]
+            if targets:
+                share = PAGERANK_DAMPING * rank[node] / len(targets)
+                for target in targets:
+                    updated[target] += share
+
+        delta = sum(abs(updated[node] - rank[node]) for node in nodes)
+        rank = updated
+        if delta < PAGERANK_TOLERANCE:
+            break
+    return rank
+
+
+def _reachable_count(graph: Dict[str, Set[str]], start: str) -> int:
+    """Count the modules transitively imported from a module."""
+    seen = {start}
+    stack = [start]
+    while stack:
+        for target in graph.get(stack.pop(), ()):
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return len(seen) - 1
+
+
+def find_entry_points(graph: Dict[str, Set[str]], files_content: Dict[str, str]) -> List[str]:
+    """Find modules that nothing imports but that start the application.
+
+    A module qualifies when no other project file imports it and it either
+    runs code on its own (a __main__ guard, a server listen call, a React
+    root) or imports other project modules. Test files are skipped. Entry
+    points are ordered by how much of the project they reach.
+    """
+    imported = set()
+    for targets in graph.values():
+        imported.update(targets)
+
+    entry_points = []
+    for filename, targets in graph.items():
+        if filename in imported or TEST_FILE_PATTERN.search(filename.replace('\\', '/')):
+            continue
+        pattern = MAIN_GUARD_PATTERN if filename.endswith('.py') else JS_ENTRY_PATTERN
+        # Only read content when needed, it may be decoded lazily from storage
+        if targets or pattern.search(files_content.get(filename, '')):
+            entry_points.append(filename)
+
+    return sorted(entry_points, key=lambda name: (-_reachable_count(graph, name), name))
+
@@ -0,0 +1,103 @@
+import base64
+import bisect
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """Encode a page position as an opaque URL-safe cursor."""
+    raw = json.dumps(position, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is invalid."""
+    if not cursor:
+        return {}
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Keep a requested page size within sane bounds."""
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def paginate_keys(keys: List[str], cursor: Optional[str], limit: Optional[int]) -> Tuple[List[str], Optional[str]]:
+    """Return one page of sorted keys and the cursor of the next page.
+
+    The cursor remembers the last key returned rather than an offset, so
+    pages stay consistent when keys are added or removed between requests.
+    """
+    limit = clamp_limit(limit)
+    after = decode_cursor(cursor).get('after')
+    if after is not None and not isinstance(after, str):
+        raise ValueError("Invalid cursor")
+    start = bisect.bisect_right(keys, after) if after is not None else 0
+    page = keys[start:start + limit]
+    next_cursor = encode_cursor({'after': page[-1]}) if start + limit < len(keys) else None
+    return page, next_cursor
+
+
+def paginate_items(items: List[Any], cursor: Optional[str], limit: Optional[int]) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of an ordered list and the cursor of the next page."""
+    limit = clamp_limit(limit)
+    start = decode_cursor(cursor).get('offset', 0)
+    # bool is an int subclass, and negative offsets would slice from the end
+    if not isinstance(start, int) or isinstance(start, bool) or start < 0:
+        raise ValueError("Invalid cursor")
+    page = items[start:start + limit]
+    next_cursor = encode_cursor({'offset': start + limit}) if start + limit < len(items) else None
+    return page, next_cursor
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma separated fields= parameter, None meaning every field."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+
+def field_requested(fields: Optional[List[str]], name: str) -> bool:
+    """Check whether a (dotted) field is needed to answer a projection."""
+    if fields is None:
+        return True
+    return any(
+        field == name or field.startswith(name + '.') or name.startswith(field + '.')
+        for field in fields
+    )
+
+
+def select_fields(data: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Project a nested dict onto dotted field paths like 'analysis.summary'."""
+    if fields is None:
+        return data
+
+    selected: Dict[str, Any] = {}
+    for field in fields:
+        parts = field.split('.')
+        source = data
+        for part in parts:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+        else:
+            # Copy the parents so a broader field selected earlier is not mutated
+            target = selected
+            for part in parts[:-1]:
+                child = target.get(part)
+                target[part] = dict(child) if isinstance(child, dict) else {}
+                target = target[part]
+            target[parts[-1]] = source
+    return selected
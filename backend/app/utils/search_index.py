@@ -0,0 +1,316 @@
+import bisect
+import heapq
+import logging
+import math
+import re
+from collections import Counter
+from itertools import chain, compress, repeat
+from operator import add, eq, ge, gt, itemgetter, mul, neg
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.documentation import MISSING_DOCSTRING
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Symbol names count more than the text describing them
+NAME_WEIGHT = 3
+
+# Stored impacts use a snapshot of the average document length, they are all
+# recomputed once the real average drifts further than this from it
+AVERAGE_LENGTH_TOLERANCE = 0.1
+
+# Terms with at least this many postings keep them ordered by impact between searches
+ORDERED_MIN_POSTINGS = 256
+
+# Documents taken from each term's postings in the first round of a multi-term search
+SEARCH_MIN_BLOCK = 32
+
+# Share of a query's postings a multi-term search reads in impact order
+# before it falls back to summing all of them
+THRESHOLD_READ_SHARE = 0.1
+
+WORD_PATTERN = re.compile(r'[A-Za-z0-9_]+')
+# Digits stay attached to the word they follow, so 'pkg7' and 'utf8' are not split
+CAMEL_CASE_PATTERN = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+\d*|[A-Z]+\d*|\d+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search tokens.
+
+    Identifiers are indexed whole and by their snake_case and camelCase
+    parts, so 'processProject' matches both 'process' and 'processproject'.
+    """
+    tokens = []
+    for word in WORD_PATTERN.findall(text):
+        lowered = word.lower()
+        tokens.append(lowered)
+        parts = [part.lower() for chunk in word.split('_') for part in CAMEL_CASE_PATTERN.findall(chunk)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class SearchIndex:
+    """In-memory BM25 inverted index over documentation entries.
+
+    Documents are grouped by the file they describe so a changed file can
+    be re-indexed without rebuilding the whole index.
+
+    Postings store each document's length normalized term frequency (its
+    impact) and large posting lists are kept ordered by impact, so a search
+    reads the best documents of each term first and stops once no unread
+    document can enter the results. Updates only touch the postings of the
+    terms of the changed documents.
+    """
+
+    def __init__(self):
+        # term -> doc_id -> tf / (tf + norm), the BM25 term frequency part
+        self.postings: Dict[str, Dict[int, float]] = {}
+        # term -> [(-impact, doc_id), ...] ascending, for terms with many postings
+        self.ordered: Dict[str, List[Tuple[float, int]]] = {}
+        self.documents: List[Optional[Dict[str, Any]]] = []
+        self.doc_terms: List[Optional[Counter]] = []
+        self.doc_lengths: List[int] = []
+        self.file_docs: Dict[str, List[int]] = {}
+        self.free_ids: List[int] = []
+        self.total_length = 0
+        self.doc_count = 0
+        # Average document length the stored impacts were computed with, None when they are stale
+        self.average_length: Optional[float] = None
+
+    def _norm(self, length: int) -> float:
+        return BM25_K1 * (1 - BM25_B + BM25_B * length / self.average_length)
+
+    def _add_document(self, document: Dict[str, Any]) -> int:
+        terms = Counter(tokenize(document.get('name', '')) * NAME_WEIGHT)
+        # Only the file document carries its path, otherwise every symbol of
+        # a directory would share its path terms and bloat their postings
+        if document.get('kind') == 'file':
+            terms.update(tokenize(document.get('file', '')))
+        terms.update(tokenize(document.get('text', '')))
+
+        if self.free_ids:
+            doc_id = self.free_ids.pop()
+            self.documents[doc_id] = document
+            self.doc_terms[doc_id] = terms
+            self.doc_lengths[doc_id] = sum(terms.values())
+        else:
+            doc_id = len(self.documents)
+            self.documents.append(document)
+            self.doc_terms.append(terms)
+            self.doc_lengths.append(sum(terms.values()))
+
+        # While impacts are stale they are all recomputed before the next search
+        norm = self._norm(self.doc_lengths[doc_id]) if self.average_length is not None else None
+        for term, frequency in terms.items():
+            impacts = self.postings.setdefault(term, {})
+            impacts[doc_id] = frequency / (frequency + norm) if norm is not None else 0.0
+            ordered = self.ordered.get(term)
+            if ordered is not None:
+                bisect.insort(ordered, (-impacts[doc_id], doc_id))
+            elif norm is not None and len(impacts) >= ORDERED_MIN_POSTINGS:
+                self._order(term)
+        self.total_length += self.doc_lengths[doc_id]
+        self.doc_count += 1
+        self._check_average_length()
+        return doc_id
+
+    def _remove_document(self, doc_id: int):
+        for term in self.doc_terms[doc_id]:
+            impacts = self.postings[term]
+            ordered = self.ordered.get(term)
+            if ordered is not None:
+                del ordered[bisect.bisect_left(ordered, (-impacts[doc_id], doc_id))]
+            del impacts[doc_id]
+            if not impacts:
+                del self.postings[term]
+                self.ordered.pop(term, None)
+        self.total_length -= self.doc_lengths[doc_id]
+        self.doc_count -= 1
+        self.documents[doc_id] = None
+        self.doc_terms[doc_id] = None
+        self.doc_lengths[doc_id] = 0
+        self.free_ids.append(doc_id)
+        self._check_average_length()
+
+    def _check_average_length(self):
+        if self.average_length is None or not self.doc_count:
+            return
+        if abs(self.total_length / self.doc_count - self.average_length) > AVERAGE_LENGTH_TOLERANCE * self.average_length:
+            self.average_length = None
+            self.ordered.clear()
+
+    def refresh_impacts(self):
+        """Recompute every impact for the current average length if they are stale.
+
+        Searches do this on demand, bulk builders call it once after adding
+        their documents so the first search does not pay for it.
+        """
+        if self.average_length is not None or not self.doc_count:
+            return
+        self.average_length = self.total_length / self.doc_count
+        for doc_id, terms in enumerate(self.doc_terms):
+            if terms is None:
+                continue
+            norm = self._norm(self.doc_lengths[doc_id])
+            for term, frequency in terms.items():
+                self.postings[term][doc_id] = frequency / (frequency + norm)
+        for term, impacts in self.postings.items():
+            if len(impacts) >= ORDERED_MIN_POSTINGS:
+                self._order(term)
+
+    def _order(self, term: str) -> List[Tuple[float, int]]:
+        ordered = sorted((-impact, doc_id) for doc_id, impact in self.postings[term].items())
+        if len(ordered) >= ORDERED_MIN_POSTINGS:
+            self.ordered[term] = ordered
+        return ordered
+
+    def update_file(self, filename: str, documents: List[Dict[str, Any]]):
+        """Replace every document indexed for a file."""
+        self.remove_file(filename)
+        self.file_docs[filename] = [self._add_document(document) for document in documents]
+
+    def remove_file(self, filename: str):
+        """Drop every document indexed for a file."""
+        for doc_id in self.file_docs.pop(filename, []):
+            self._remove_document(doc_id)
+
+    def replace_files(self, filenames: List[str], components: List[Dict[str, Any]]):
+        """Re-index some files: drop all their documents, then index the given components.
+
+        Files in filenames without a component, for example ones that no
+        longer define any symbol, end up with no documents.
+        """
+        for filename in filenames:
+            self.remove_file(filename)
+        for component in components:
+            self.update_file(component.get('file', ''), component_documents(component))
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return the best matching documents for a query, highest score first."""
+        terms = [term for term in set(tokenize(query)) if term in self.postings]
+        if not terms or not self.doc_count or limit < 1:
+            return []
+
+        self.refresh_impacts()
+        lists = []
+        for term in terms:
+            frequency = len(self.postings[term])
+            idf = math.log(1 + (self.doc_count - frequency + 0.5) / (frequency + 0.5))
+            lists.append((idf * (BM25_K1 + 1), self.postings[term], self.ordered.get(term) or self._order(term)))
+
+        if len(lists) == 1:
+            weight, _, ordered = lists[0]
+            best = [(-weight * negative_impact, doc_id) for negative_impact, doc_id in ordered[:limit]]
+        else:
+            best = self._top_documents(lists, limit)
+        return [{**self.documents[doc_id], 'score': round(score, 4)} for score, doc_id in best]
+
+    @staticmethod
+    def _top_documents(
+        lists: List[Tuple[float, Dict[int, float], List[Tuple[float, int]]]],
+        limit: int
+    ) -> List[Tuple[float, int]]:
+        """Best documents for several terms, reading each term's postings best impact first.
+
+        Each round reads the next block of every ordered posting list and
+        scores the new documents in full. A document not read yet has, in
+        every list, at most the impact at the current depth, so once the
+        worst result scores at least the sum of those the results are final.
+        When that would mean reading most postings anyway, summing every
+        posting once is cheaper than looking each document up in every list.
+        """
+        best: List[Tuple[float, int]] = []
+        seen = set()
+        depth, block = 0, max(limit, SEARCH_MIN_BLOCK)
+        budget = sum(len(impacts) for _, impacts, _ in lists) * THRESHOLD_READ_SHARE
+        while (depth + block) * len(lists) <= budget:
+            end = depth + block
+            new_ids = list(set(chain.from_iterable(
+                map(itemgetter(1), ordered[depth:end]) for _, _, ordered in lists
+            )).difference(seen))
+            seen.update(new_ids)
+            # Score the whole block one term at a time so the lookups run in C
+            scores = [0.0] * len(new_ids)
+            for weight, impacts, _ in lists:
+                scores = list(map(add, scores, map(mul, repeat(weight), map(impacts.get, new_ids, repeat(0.0)))))
+            # Ties keep the lower doc_id, like the order of the postings
+            candidates = zip(scores, map(neg, new_ids))
+            if len(best) == limit:
+                candidates = [candidate for candidate in candidates if candidate > best[-1]]
+            best = heapq.nlargest(limit, chain(best, candidates))
+            depth, block = end, block * 2
+            bound = sum(-weight * ordered[depth][0] for weight, _, ordered in lists if depth < len(ordered))
+            if len(best) == limit and best[-1][0] >= bound:
+                return [(score, -negative_id) for score, negative_id in best]
+
+        # Terms are summed in the same order as above, so equal documents get equal scores
+        weight, impacts, _ = lists[0]
+        scores = dict(zip(impacts, map(mul, repeat(weight), impacts.values())))
+        get_score = scores.get
+        for weight, impacts, _ in lists[1:]:
+            for doc_id, impact in impacts.items():
+                scores[doc_id] = get_score(doc_id, 0.0) + weight * impact
+        # The results found so far bound the score the final ones need
+        floor = best[-1][0] if len(best) == limit else -math.inf
+        doc_ids = list(compress(scores, map(ge, scores.values(), repeat(floor))))
+        values = list(map(scores.__getitem__, doc_ids))
+        if len(values) > limit:
+            # Sorting plain floats and ids is much faster than a heap of tuples
+            kth = sorted(values, reverse=True)[limit - 1]
+            above = list(compress(doc_ids, map(gt, values, repeat(kth))))
+            ties = sorted(compress(doc_ids, map(eq, values, repeat(kth))))
+            doc_ids = above + ties[:limit - len(above)]
+        return sorted(((scores[doc_id], doc_id) for doc_id in doc_ids), key=lambda item: (-item[0], item[1]))
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+
+def _docstring(info: Dict[str, Any]) -> str:
+    # The analyzers' placeholder for symbols without a docstring is not worth indexing
+    docstring = info.get('docstring', '')
+    return '' if docstring == MISSING_DOCSTRING else docstring
+
+
+def component_documents(component: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Turn an analyzed component (file, classes, functions) into search documents."""
+    filename = component.get('file', '')
+    documents = [{
+        'kind': 'file',
+        'name': filename.replace('\\', '/').split('/')[-1],
+        'file': filename,
+        'text': component.get('description', '')
+    }]
+
+    for class_info in component.get('classes', []):
+        documents.append({
+            'kind': 'class',
+            'name': class_info.get('name', ''),
+            'file': filename,
+            'text': f"{_docstring(class_info)} {' '.join(class_info.get('methods', []))}"
+        })
+
+    for function_info in component.get('functions', []):
+        documents.append({
+            'kind': 'function',
+            'name': function_info.get('name', ''),
+            'file': filename,
+            'text': f"{_docstring(function_info)} {' '.join(function_info.get('args', []))}"
+        })
+
+    return documents
+
+
+def build_search_index(components: List[Dict[str, Any]]) -> SearchIndex:
+    """Build a search index from a list of analyzed components."""
+    index = SearchIndex()
+    for component in components:
+        index.update_file(component.get('file', ''), component_documents(component))
+    index.refresh_impacts()
+    logger.info(f"Indexed {len(index)} documents from {len(components)} files")
+    return index
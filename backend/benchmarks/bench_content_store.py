@@ -0,0 +1,153 @@
+"""Compare the memory used to hold project files in plain dicts vs the ContentStore.
+
+Usage:
+    python -m benchmarks.bench_content_store [--projects 40] [--files 400]
+        [--duplicate-ratio 0.3] [--non-ascii-ratio 0.2] [--source DIR] [--json]
+
+Each variant runs in a fresh subprocess and reports the resident set size
+it added on top of an empty interpreter, once after loading and once after
+reading every file back (pages of spill files touched by the reads count
+towards RSS but stay reclaimable by the OS). With --source the files of a
+real project directory are used as the template for every project.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+VARIANTS = ('dict', 'store', 'store-spill')
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # Peak RSS is the best portable approximation
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def synthetic_file(rng: random.Random, index: int, non_ascii: bool) -> str:
+    lines = [f"def function_{index}_{line}(value):\n    return value * {line}\n" for line in range(rng.randint(20, 200))]
+    if non_ascii:
+        # A single non-ASCII character makes CPython store the whole str with 2 or 4 bytes per character
+        lines.insert(0, "# Übersicht ✓\n")
+    return ''.join(lines)
+
+
+def build_projects(args):
+    """Yield (name, files) for every project of the benchmark corpus."""
+    rng = random.Random(42)
+    if args.source:
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        from app.services.ingestion import read_project_directory
+        template, _ = read_project_directory(Path(args.source))
+    else:
+        template = None
+
+    shared = [synthetic_file(rng, index, False) for index in range(50)]
+    for project in range(args.projects):
+        if template is not None:
+            # Same files in every project, one file changed per project
+            files = {path: content.encode('utf-8').decode('utf-8') for path, content in template.items()}
+            files[f"project_{project}.py"] = f"PROJECT = {project}\n"
+        else:
+            files = {}
+            for index in range(args.files):
+                if rng.random() < args.duplicate_ratio:
+                    # Decoded uploads never share str objects, even for identical files
+                    content = rng.choice(shared).encode('utf-8').decode('utf-8')
+                else:
+                    content = synthetic_file(rng, project * args.files + index, rng.random() < args.non_ascii_ratio)
+                files[f"pkg/module_{index}.py"] = content
+        yield f"project_{project}", files
+
+
+def run_variant(args) -> dict:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from app.utils.content_store import ContentStore
+
+    gc.collect()
+    baseline = current_rss()
+    start = time.perf_counter()
+    # Closing the store deletes its spill files
+    with ContentStore() as store:
+        projects = {}
+        raw_bytes = 0
+        for name, files in build_projects(args):
+            raw_bytes += sum(len(content.encode('utf-8')) for content in files.values())
+            if args.variant == 'dict':
+                projects[name] = files
+            else:
+                projects[name] = store.add_project(name, files)
+                if args.variant == 'store-spill':
+                    store.spill_cold(keep_hot=args.hot)
+            del files
+        gc.collect()
+        load_seconds = time.perf_counter() - start
+        loaded_rss = current_rss() - baseline
+
+        # Read every file back once, as the analyzers would
+        start = time.perf_counter()
+        characters = sum(len(content) for files in projects.values() for content in files.values())
+        read_seconds = time.perf_counter() - start
+
+        return {
+            "variant": args.variant,
+            "projects": len(projects),
+            "files": sum(len(files) for files in projects.values()),
+            "utf8_bytes": raw_bytes,
+            "characters": characters,
+            "rss_bytes": loaded_rss,
+            "rss_after_read_bytes": current_rss() - baseline,
+            "load_seconds": round(load_seconds, 3),
+            "read_seconds": round(read_seconds, 3)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--projects', type=int, default=40)
+    parser.add_argument('--files', type=int, default=400)
+    parser.add_argument('--duplicate-ratio', type=float, default=0.3)
+    parser.add_argument('--non-ascii-ratio', type=float, default=0.2)
+    parser.add_argument('--hot', type=int, default=4, help='hot projects kept by the store-spill variant')
+    parser.add_argument('--source', help='project directory used as the template for every project')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    parser.add_argument('--variant', choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args)))
+        return
+
+    results = []
+    for variant in VARIANTS:
+        command = [sys.executable, os.path.abspath(__file__), '--variant', variant] + sys.argv[1:]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    dict_rss = results[0]["rss_bytes"] or 1
+    print(f"{results[0]['projects']} projects, {results[0]['files']} files, "
+          f"{results[0]['utf8_bytes'] / 2**20:.1f} MiB of UTF-8 content")
+    print(f"{'variant':<14}{'RSS MiB':>10}{'vs dict':>10}{'after read':>12}{'load s':>10}{'read s':>10}")
+    for result in results:
+        print(f"{result['variant']:<14}{result['rss_bytes'] / 2**20:>10.1f}"
+              f"{result['rss_bytes'] / dict_rss:>10.2f}{result['rss_after_read_bytes'] / 2**20:>12.1f}"
+              f"{result['load_seconds']:>10.3f}{result['read_seconds']:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
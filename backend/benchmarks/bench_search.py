@@ -0,0 +1,107 @@
+"""Measure search latency of the documentation index on a synthetic project.
+
+Usage:
+    python -m benchmarks.bench_search [--files 5000] [--repeat 5] [--json]
+
+Every file contributes a file, a class and nine function documents, so the
+default corpus holds 55k documents whose names share a small vocabulary.
+That makes 'handle', 'value' and the symbol words common terms with tens of
+thousands of postings. Each query is timed right after an index update
+(uncached) and again without one (warm), and the best of --repeat runs is
+reported.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+WORDS = ['handler', 'request', 'parse', 'config', 'user', 'token', 'cache', 'store', 'event', 'load']
+
+QUERIES = (
+    'src',
+    'pkg7',
+    'src pkg7 handler',
+    'handler request',
+    'handle value',
+    'parse request cache',
+    'service run',
+)
+
+
+def synthetic_components(files: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            'file': f'src/pkg{number % 50}/module_{number}.py',
+            'description': f'Module {number} handles {WORDS[number % 10]}.',
+            'classes': [{'name': f'{WORDS[number % 7].title()}Service{number}', 'docstring': 'A service.', 'methods': ['run']}],
+            'functions': [
+                {'name': f'{WORDS[(number + i) % 10]}_{WORDS[i]}_{i}', 'docstring': f'Handle {WORDS[i]}.', 'args': ['value']}
+                for i in range(9)
+            ],
+        }
+        for number in range(files)
+    ]
+
+
+def run(args) -> Dict[str, Any]:
+    from app.utils.search_index import build_search_index, component_documents
+
+    components = synthetic_components(args.files)
+    start = time.perf_counter()
+    index = build_search_index(components)
+    build_seconds = time.perf_counter() - start
+
+    queries = []
+    for query in QUERIES:
+        updates, uncached, warm = [], [], []
+        for number in range(args.repeat):
+            component = components[number % len(components)]
+            start = time.perf_counter()
+            index.update_file(component['file'], component_documents(component))
+            updates.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            results = index.search(query)
+            uncached.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            index.search(query)
+            warm.append(time.perf_counter() - start)
+        queries.append({
+            "query": query,
+            "results": len(results),
+            "update_ms": round(min(updates) * 1000, 3),
+            "uncached_ms": round(min(uncached) * 1000, 3),
+            "warm_ms": round(min(warm) * 1000, 3)
+        })
+
+    return {
+        "documents": len(index),
+        "build_seconds": round(build_seconds, 3),
+        "queries": queries
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per query, the best one is reported')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{result['documents']} documents indexed in {result['build_seconds']:.2f}s")
+    print(f"{'query':<24}{'results':>8}{'update ms':>11}{'uncached ms':>13}{'warm ms':>10}")
+    for query in result["queries"]:
+        print(f"{query['query']:<24}{query['results']:>8}{query['update_ms']:>11.2f}"
+              f"{query['uncached_ms']:>13.2f}{query['warm_ms']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
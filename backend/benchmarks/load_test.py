@@ -0,0 +1,195 @@
+"""In-process load test of the FastAPI app with many concurrent clients.
+
+Usage:
+    python -m benchmarks.load_test [--clients 20] [--iterations 5]
+        [--files 30] [--llm-latency-ms 200] [--llm-jitter-ms 50]
+        [--output results.json]
+
+Every client repeatedly uploads a generated project, lists projects,
+generates its documentation and deletes it, talking to the ASGI app
+directly through httpx (no network, no server process). Gemini is
+replaced by a local fake with configurable latency, so results measure
+the app itself. A monitor task records event loop lag while the test
+runs. Results are printed as JSON for tracking regressions over time.
+
+Requires httpx in addition to the app's own dependencies.
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import random
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+OPERATIONS = ('upload', 'list', 'generate', 'delete')
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeModel:
+    """Stand-in for the Gemini model that sleeps instead of calling the API."""
+
+    def __init__(self, latency_ms: float, jitter_ms: float, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        # Called from worker threads by the LLM layer
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._random.gauss(self.latency, self.jitter))
+        time.sleep(delay)
+        return FakeResponse(f"Generated description for a {len(prompt)} character prompt.")
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(share * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "max_ms": round(max(values) * 1000, 3) if values else 0.0
+    }
+
+
+def build_project_zip(files: int, seed: int) -> bytes:
+    """Create a zip archive of a small synthetic Python project."""
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('requirements.txt', 'fastapi\nrequests\n')
+        archive.writestr('app/__init__.py', '')
+        archive.writestr('app/main.py', 'from app import module_0\n\nif __name__ == "__main__":\n    module_0.run_0()\n')
+        for index in range(files):
+            functions = '\n'.join(
+                f'def run_{index}_{number}(value):\n    """Return a scaled value."""\n    return value * {number}\n'
+                for number in range(rng.randint(2, 12))
+            )
+            imports = f"from app import module_{index - 1}\n\n" if index else ""
+            archive.writestr(f'app/module_{index}.py', f'"""Module {index}."""\n{imports}{functions}\ndef run_{index}():\n    pass\n')
+    return buffer.getvalue()
+
+
+async def monitor_loop_lag(lags: List[float], stop: asyncio.Event, interval: float = 0.01):
+    """Record how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_client(client, client_id: int, args, latencies: Dict[str, List[float]], errors: Dict[str, int]):
+    """Run upload, list, generate and delete `iterations` times."""
+    for iteration in range(args.iterations):
+        name = f"load-{client_id}-{iteration}"
+        payload = build_project_zip(args.files, seed=client_id * 1000 + iteration)
+        requests = (
+            ('upload', lambda: client.post('/api/projects', files={'file': (f"{name}.zip", payload, 'application/zip')})),
+            ('list', lambda: client.get('/api/projects', params={'fields': 'technologies'})),
+            ('generate', lambda: client.post(f'/api/generate-docs/{name}')),
+            ('delete', lambda: client.delete(f'/api/projects/{name}'))
+        )
+        for operation, send in requests:
+            start = time.perf_counter()
+            try:
+                response = await send()
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies[operation].append(time.perf_counter() - start)
+            if failed:
+                errors[operation] += 1
+
+
+async def run_load_test(args) -> Dict[str, Any]:
+    import httpx
+    from app.main import app
+    from app.services import llm
+
+    fake_model = FakeModel(args.llm_latency_ms, args.llm_jitter_ms)
+    llm.model = fake_model
+    llm.set_concurrency(args.llm_concurrency)
+
+    latencies = {operation: [] for operation in OPERATIONS}
+    errors = {operation: 0 for operation in OPERATIONS}
+    lags: List[float] = []
+    stop = asyncio.Event()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=None) as client:
+        monitor = asyncio.create_task(monitor_loop_lag(lags, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            run_client(client, client_id, args, latencies, errors) for client_id in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await monitor
+
+    total_requests = sum(len(values) for values in latencies.values())
+    return {
+        "config": {
+            "clients": args.clients,
+            "iterations": args.iterations,
+            "files_per_project": args.files,
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_jitter_ms": args.llm_jitter_ms,
+            "llm_concurrency": args.llm_concurrency
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "requests": total_requests,
+        "throughput_rps": round(total_requests / elapsed, 3) if elapsed else 0.0,
+        "errors": errors,
+        "operations": {operation: summarize(values) for operation, values in latencies.items()},
+        "event_loop_lag": summarize(lags),
+        "llm_calls": fake_model.calls,
+        "llm_stats": llm.get_stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=20, help='concurrent clients')
+    parser.add_argument('--iterations', type=int, default=5, help='upload/list/generate/delete rounds per client')
+    parser.add_argument('--files', type=int, default=30, help='Python modules per uploaded project')
+    parser.add_argument('--llm-latency-ms', type=float, default=200.0, help='mean fake Gemini latency')
+    parser.add_argument('--llm-jitter-ms', type=float, default=50.0, help='standard deviation of the fake latency')
+    parser.add_argument('--llm-concurrency', type=int, default=8, help='cap on concurrent fake Gemini calls')
+    parser.add_argument('--output', type=Path, help='also write the JSON results to this file')
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load_test(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
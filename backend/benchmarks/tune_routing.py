@@ -0,0 +1,95 @@
+"""Tune the model routing tiers offline against a stub Gemini model.
+
+Usage:
+    python -m benchmarks.tune_routing PROJECT_DIR [--thresholds 0,2,4,6,8,12,16]
+        [--llm-latency-ms 1500] [--llm-jitter-ms 300] [--top-k 0] [--output tuning.json]
+
+For every candidate template threshold the project's components are
+analyzed with the tiers 'template:<threshold>,remote', with Gemini replaced
+by the load test's fake model, and the routing decisions, wall time and
+estimated latency saved are reported as JSON. Files routed to the template
+tier are listed with their score so their generated text can be reviewed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.load_test import FakeModel, percentile
+
+
+async def evaluate(files_content: Dict[str, str], thresholds: List[float], top_k: int) -> List[Dict[str, Any]]:
+    from app.services import model_routing
+    from app.services.documentation import analyze_main_components
+
+    results = []
+    for threshold in thresholds:
+        model_routing.set_tiers(f"template:{threshold},remote")
+        model_routing.reset_stats()
+        start = time.perf_counter()
+        components = await analyze_main_components(files_content, top_k=top_k)
+        elapsed = time.perf_counter() - start
+        results.append({
+            "threshold": threshold,
+            "elapsed_seconds": round(elapsed, 3),
+            **model_routing.get_stats(),
+            "template_files": [
+                {"file": component["file"], "complexity": component["complexity"], "description": component["description"]}
+                for component in components if component["tier"] == 'template'
+            ]
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source', type=Path, help='project directory to analyze')
+    parser.add_argument('--thresholds', default='0,2,4,6,8,12,16', help='comma separated template tier bounds')
+    parser.add_argument('--llm-latency-ms', type=float, default=1500.0, help='mean stub Gemini latency')
+    parser.add_argument('--llm-jitter-ms', type=float, default=300.0, help='standard deviation of the stub latency')
+    parser.add_argument('--llm-concurrency', type=int, default=4, help='cap on concurrent stub Gemini calls')
+    parser.add_argument('--top-k', type=int, default=0, help='remote description budget, 0 means no limit')
+    parser.add_argument('--output', type=Path, help='also write the JSON results to this file')
+    args = parser.parse_args()
+
+    from app.services import llm
+    from app.services.ingestion import read_project_directory
+    from app.services.model_routing import complexity_metrics, complexity_score
+    from app.services.documentation import extract_classes, extract_functions
+
+    llm.model = FakeModel(args.llm_latency_ms, args.llm_jitter_ms)
+    llm.set_concurrency(args.llm_concurrency)
+
+    files_content, _ = read_project_directory(args.source)
+    thresholds = [float(value) for value in args.thresholds.split(',') if value.strip()]
+
+    async def run() -> Dict[str, Any]:
+        scores = []
+        for filename, content in files_content.items():
+            if filename.endswith('.py'):
+                classes, functions = await extract_classes(content), await extract_functions(content)
+                if classes or functions:
+                    scores.append(complexity_score(complexity_metrics(content, classes, functions)))
+        return {
+            "project": str(args.source),
+            "components": len(scores),
+            "score_percentiles": {
+                f"p{int(share * 100)}": percentile(scores, share) for share in (0.1, 0.25, 0.5, 0.75, 0.9)
+            },
+            "runs": await evaluate(files_content, thresholds, args.top_k)
+        }
+
+    results = asyncio.run(run())
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
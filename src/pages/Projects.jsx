@@ -99,26 +99,36 @@ function Projects() {
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false);
   const [projectToDelete, setProjectToDelete] = useState(null);
 
-  useEffect(() => {
-    const fetchProjects = async () => {
-      try {
-        setLoading(true);
-        const response = await fetch('http://localhost:8000/api/projects');
-        if (!response.ok) {
-          const errorData = await response.json();
-          throw new Error(errorData.detail || 'Failed to fetch projects');
-        }
-        const data = await response.json();
-        console.log('Projects:', data);
-        setProjects(data);
-      } catch (error) {
-        console.error('Error fetching projects:', error);
-        setError(error.message);
-      } finally {
-        setLoading(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalProjects, setTotalProjects] = useState(0);
+
+  // Only the fields shown in the list are requested, a page at a time
+  const fetchProjects = async (cursor = null) => {
+    try {
+      setLoading(true);
+      const params = new URLSearchParams({ limit: '50', fields: 'technologies' });
+      if (cursor) {
+        params.set('cursor', cursor);
+      }
+      const response = await fetch(`http://localhost:8000/api/projects?${params}`);
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.detail || 'Failed to fetch projects');
       }
-    };
+      const data = await response.json();
+      console.log('Projects:', data);
+      setProjects((previous) => (cursor ? [...previous, ...data.items] : data.items));
+      setNextCursor(data.next_cursor);
+      setTotalProjects(data.total);
+    } catch (error) {
+      console.error('Error fetching projects:', error);
+      setError(error.message);
+    } finally {
+      setLoading(false);
+    }
+  };
 
+  useEffect(() => {
     fetchProjects();
   }, []);
 
@@ -208,7 +218,7 @@ function Projects() {
     <Container maxWidth="lg">
       <Box sx={{ mb: 4 }}>
         <Typography variant="h4" component="h1" gutterBottom>
-          Projects ({projects.length})
+          Projects ({totalProjects})
         </Typography>
       </Box>
 
@@ -258,6 +268,14 @@ function Projects() {
           </Paper>
         ))}
 
+        {nextCursor && (
+          <Box sx={{ textAlign: 'center' }}>
+            <Button onClick={() => fetchProjects(nextCursor)} disabled={loading}>
+              Load more
+            </Button>
+          </Box>
+        )}
+
         {/* Delete Confirmation Dialog */}
         <Dialog
           open={deleteDialogOpen}